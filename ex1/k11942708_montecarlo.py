@@ -1,4 +1,28 @@
-from random import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from math import sqrt
+
+import numpy as np
+
+from rectangle_grid import RectangleGrid
+from samplers import UniformSampler
+from sweep_line import covered_area
+
+CHUNK_SIZE = 1 << 20
+
+# area() computes the exact area once sampling would cost more shots than this per rectangle
+EXACT_SHOTS_PER_RECTANGLE = 100
+
+_worker_monte_carlo = None
+
+
+def _init_worker(monte_carlo):
+    global _worker_monte_carlo
+    _worker_monte_carlo = monte_carlo
+
+
+def _count_uncovered_in_worker(seed_sequence, size, sampler):
+    return _worker_monte_carlo._count_uncovered(seed_sequence, size, sampler)
 
 
 class MonteCarlo:
@@ -12,32 +36,154 @@ class MonteCarlo:
         :param rectangles -- array that contains the embedded rectangles
         """
         self.length, self.width, self.rectangles = length, width, rectangles
+        self.grid = None
 
-    def area(self, num_of_shots):
+    def area(self, num_of_shots, chunk_size=None, seed=None, workers=None, method='auto', sampler=None):
         """Method to estimate the area of the enclosing rectangle that is not covered by the embedded rectangles
 
         Keyword arguments:
         :param num_of_shots -- Number of generated random points whose location (inside/outside) is analyzed
+        :param chunk_size -- Number of points sampled and counted at once, bounds the memory used; None for CHUNK_SIZE
+        :param seed -- Seed of the random streams; for a fixed seed and chunk_size the result does not depend
+                       on the number of workers
+        :param workers -- Number of processes the chunks are spread over, None or 1 to sample in this process
+        :param method -- 'monte_carlo' to sample, 'exact' to compute the area with a sweep line, 'auto' to compute it
+                         exactly when num_of_shots reaches EXACT_SHOTS_PER_RECTANGLE per embedded rectangle and
+                         none of chunk_size, seed, workers and sampler is given (those always ask for sampling)
+        :param sampler -- Sampler placing the points of every chunk (see samplers), None for uniform points
+        :return float -- the area of the enclosing rectangle not covered.
+        :raises ValueError if num_of_shots is None, the method is unknown or 'exact' is combined with
+                workers or a sampler
+        """
+        if num_of_shots is None: raise ValueError
+        if method not in ('auto', 'monte_carlo', 'exact'): raise ValueError(f'unknown method {method!r}')
+        if method == 'exact' and (workers is not None or sampler is not None):
+            raise ValueError('the exact area is not sampled, workers and sampler do not apply')
+        sampling_requested = chunk_size is not None or seed is not None or workers is not None or sampler is not None
+        if method == 'exact' or method == 'auto' and not sampling_requested and self.rectangles is not None and \
+                num_of_shots >= EXACT_SHOTS_PER_RECTANGLE * max(1, len(self.rectangles)):
+            return self.exact_area()
+        estimate = None
+        chunk_size = CHUNK_SIZE if chunk_size is None else chunk_size
+        for estimate, _ in self.estimates(num_of_shots, chunk_size, seed, workers, sampler): pass
+        if estimate is None: raise ZeroDivisionError('no shots to estimate the area from')
+        return estimate
+
+    def exact_area(self):
+        """Method to compute the area of the enclosing rectangle that is not covered by the embedded rectangles exactly
+
         :return float -- the area of the enclosing rectangle not covered.
         :raises ValueError if any of the parameters is None
         """
-        if self.length is None or self.width is None or num_of_shots is None or self.rectangles is None: raise ValueError
-        total = []
-        for strike in range(num_of_shots): x = random() * self.length; y = random() * self.width; total.append((x, y))
+        if self.length is None or self.width is None or self.rectangles is None: raise ValueError
+        return self.length * self.width - covered_area(self.length, self.width, self.rectangles)
 
-        enumeration = 0
-        shots = 0
-        score = False
+    def estimates(self, num_of_shots=None, chunk_size=CHUNK_SIZE, seed=None, workers=None, sampler=None):
+        """Generator that samples the enclosing rectangle chunk by chunk and yields the running estimate
 
-        for strike in total:
-            for hit in self.rectangles:
-                if self.inside(strike[0], strike[1], hit): score = True; break
-            if score is True: shots += 1
-            else: enumeration += 1; shots += 1
-            score = False
+        Every chunk draws from its own random stream, derived from the seed and the index of the chunk,
+        so the chunks can be sampled in any process and merged in order with an identical result.
+        For independent points the standard error is the binomial one. The points of the variance-reducing
+        samplers are not independent within a chunk, but the chunks are, so their standard error is taken
+        from the spread of the per-chunk estimates (the binomial one, an upper bound, until there are two chunks).
+
+        Keyword arguments:
+        :param num_of_shots -- Total number of points to sample, None to sample until the caller stops iterating
+        :param chunk_size -- Number of points sampled and counted at once, bounds the memory used
+        :param seed -- Seed of the random streams, None to draw fresh entropy from the operating system
+        :param workers -- Number of processes the chunks are spread over, None or 1 to sample in this process
+        :param sampler -- Sampler placing the points of every chunk (see samplers), None for uniform points
+        :return generator -- yields (estimate, standard error) of the uncovered area after every chunk
+        :raises ValueError if any of the parameters is None or chunk_size or workers is not positive
+        """
+        if self.length is None or self.width is None or self.rectangles is None or chunk_size is None: raise ValueError
+        if chunk_size <= 0: raise ValueError('chunk_size must be positive')
+        if workers is not None and workers <= 0: raise ValueError('workers must be positive')
+
+        if sampler is None: sampler = UniformSampler()
+        self.rectangle_grid()
+        entropy = np.random.SeedSequence(seed).entropy
+        tasks = ((np.random.SeedSequence(entropy, spawn_key=(index,)), size)
+                 for index, size in enumerate(self._chunk_sizes(num_of_shots, chunk_size)))
+        if workers is None or workers == 1:
+            counts = ((size, self._count_uncovered(seed_sequence, size, sampler)) for seed_sequence, size in tasks)
+        else:
+            counts = self._count_uncovered_parallel(tasks, workers, sampler)
 
         field = self.length * self.width
-        return field * (enumeration / shots)
+        enumeration = shots = chunks = 0
+        chunk_mean = chunk_squares = 0.0
+        for size, uncovered in counts:
+            enumeration += uncovered
+            shots += size
+
+            # running mean and sum of squared deviations of the per-chunk estimates (Welford)
+            chunks += 1
+            deviation = uncovered / size - chunk_mean
+            chunk_mean += deviation / chunks
+            chunk_squares += deviation * (uncovered / size - chunk_mean)
+
+            p = enumeration / shots
+            if sampler.iid or chunks == 1:
+                yield field * p, field * sqrt(p * (1 - p) / shots)
+            else:
+                yield field * p, field * sqrt(chunk_squares / (chunks - 1) / chunks)
+
+    def _chunk_sizes(self, num_of_shots, chunk_size):
+        shots = 0
+        while num_of_shots is None or shots < num_of_shots:
+            size = chunk_size if num_of_shots is None else min(chunk_size, num_of_shots - shots)
+            shots += size
+            yield size
+
+    def _count_uncovered(self, seed_sequence, size, sampler):
+        x, y = sampler.sample(np.random.default_rng(seed_sequence), size)
+        x, y = x * self.length, y * self.width
+        return size - int(np.count_nonzero(self.covered(x, y)))
+
+    def _count_uncovered_parallel(self, tasks, workers, sampler):
+        # only a bounded window of chunks is in flight, so an unbounded stream does not pile up futures
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self,))
+        pending = deque()
+        try:
+            for seed_sequence, size in tasks:
+                pending.append((size, executor.submit(_count_uncovered_in_worker, seed_sequence, size, sampler)))
+                if len(pending) >= 2 * workers:
+                    size, future = pending.popleft()
+                    yield size, future.result()
+            while pending:
+                size, future = pending.popleft()
+                yield size, future.result()
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def covered(self, x, y):
+        """Method to determine for a batch of points which of them lie inside at least one embedded rectangle
+
+        Keyword arguments:
+        :param x,y -- NumPy arrays with the coordinates of the points to check
+        :return numpy.ndarray -- boolean mask, True where the point is covered by a rectangle
+        """
+        return self.rectangle_grid().covered(x, y)
+
+    def covers(self, x, y):
+        """Method to determine if a given point (x,y) is inside any embedded rectangle
+
+        Keyword arguments:
+        :param x,y -- coordinates of the point to check
+        :return bool
+        :raises ValueError if any of the parameters is None
+        """
+        if x is None or y is None: raise ValueError
+        return any(self.inside(x, y, rect) for rect in self.rectangle_grid().candidates(x, y))
+
+    def rectangle_grid(self):
+        """Method to get the spatial index over the embedded rectangles, built on first use
+
+        :return RectangleGrid
+        """
+        if self.grid is None: self.grid = RectangleGrid(self.length, self.width, self.rectangles)
+        return self.grid
 
     def inside(self, x, y, rect):
         """Method to determine if a given point (x,y) is inside a given rectangle
@@ -0,0 +1,71 @@
+from random import random, seed
+from time import perf_counter
+
+from montecarlo import MonteCarlo
+from rectangle import Rectangle
+from samplers import HaltonSampler, LatinHypercubeSampler, SobolSampler, StratifiedSampler, UniformSampler
+
+
+def obstacles(count, length, width):
+    """Method to generate a reproducible set of small rectangles inside the enclosing rectangle
+
+    Keyword arguments:
+    :param count -- number of rectangles
+    :param length, width -- size of the enclosing rectangle
+    :return list -- the generated rectangles
+    """
+    seed(0)
+    return [Rectangle(random() * length, random() * width, random() * length / 50, random() * width / 50)
+            for _ in range(count)]
+
+
+def reference_area(monte_carlo, num_of_shots):
+    """The original per-point loop, kept as the baseline for the comparison."""
+    enumeration = 0
+    for _ in range(num_of_shots):
+        x, y = random() * monte_carlo.length, random() * monte_carlo.width
+        if not any(monte_carlo.inside(x, y, rect) for rect in monte_carlo.rectangles): enumeration += 1
+    return monte_carlo.length * monte_carlo.width * enumeration / num_of_shots
+
+
+def shots_to_target(monte_carlo, sampler, target, chunk_size=1 << 14):
+    """Method to count the shots a sampler needs until the reported standard error drops below target"""
+    shots = 0
+    for shots_in_chunk, (_, error) in enumerate(monte_carlo.estimates(chunk_size=chunk_size, seed=0, sampler=sampler)):
+        shots = (shots_in_chunk + 1) * chunk_size
+        if shots_in_chunk >= 7 and error < target: return shots
+
+
+def timed(function, *args, **kwargs):
+    start = perf_counter()
+    result = function(*args, **kwargs)
+    return result, perf_counter() - start
+
+
+def main():
+    monte_carlo = MonteCarlo(100, 30, obstacles(300, 100, 30))
+    baseline_shots, shots = 10 ** 4, 10 ** 7
+
+    _, baseline = timed(reference_area, monte_carlo, baseline_shots)
+    estimate, vectorized = timed(monte_carlo.area, shots, method='monte_carlo')
+    baseline_rate, vectorized_rate = baseline_shots / baseline, shots / vectorized
+
+    print(f'per-point loop: {baseline_rate:14,.0f} shots/s')
+    print(f'vectorized:     {vectorized_rate:14,.0f} shots/s  (area {estimate:.3f})')
+    print(f'speed-up:       {vectorized_rate / baseline_rate:14.1f}x')
+
+    dense = MonteCarlo(100, 30, obstacles(10 ** 4, 100, 30))
+    estimate, elapsed = timed(dense.area, shots, method='monte_carlo')
+    print(f'10^4 rectangles:{shots / elapsed:14,.0f} shots/s  (area {estimate:.3f})')
+
+    for workers in (1, 2, 4):
+        estimate, elapsed = timed(monte_carlo.area, shots, 1 << 18, 0, workers, 'monte_carlo')
+        print(f'{workers} worker(s):    {shots / elapsed:14,.0f} shots/s  (area {estimate:.3f}, seed 0)')
+
+
+    for sampler in (UniformSampler(), StratifiedSampler(), LatinHypercubeSampler(), HaltonSampler(), SobolSampler()):
+        print(f'{type(sampler).__name__:22} {shots_to_target(monte_carlo, sampler, 0.5):12,} shots to a standard error < 0.5')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+from math import ceil, sqrt
+
+import numpy as np
+
+
+class RectangleGrid:
+
+    def __init__(self, length, width, rectangles):
+        """constructor, builds a uniform grid over the enclosing rectangle that lists for every cell
+        the embedded rectangles overlapping it
+
+        Keyword arguments:
+        :param length -- length of the enclosing rectangle
+        :param width -- width of the enclosing rectangle
+        :param rectangles -- array that contains the embedded rectangles
+        """
+        self.rectangles = rectangles
+        self.x0 = np.array([rect.origin_x for rect in rectangles], dtype=float)
+        self.y0 = np.array([rect.origin_y for rect in rectangles], dtype=float)
+        self.x1 = self.x0 + np.array([rect.length for rect in rectangles], dtype=float)
+        self.y1 = self.y0 + np.array([rect.width for rect in rectangles], dtype=float)
+
+        # about one cell per rectangle, shaped like the enclosing rectangle
+        cells = max(1, len(rectangles))
+        self.columns = max(1, ceil(sqrt(cells * length / width)))
+        self.rows = max(1, ceil(cells / self.columns))
+        self.cell_length, self.cell_width = length / self.columns, width / self.rows
+
+        cx0, cx1 = self._column(self.x0), self._column(self.x1)
+        cy0, cy1 = self._row(self.y0), self._row(self.y1)
+        spans = np.maximum(cx1 - cx0 + 1, 0)
+        counts = spans * np.maximum(cy1 - cy0 + 1, 0)
+
+        # one (cell, rectangle) pair for every cell a rectangle overlaps
+        owner = np.repeat(np.arange(len(rectangles)), counts)
+        offset = np.arange(len(owner)) - np.repeat(np.cumsum(counts) - counts, counts)
+        cell = (cy0[owner] + offset // np.maximum(spans[owner], 1)) * self.columns + cx0[owner] + offset % np.maximum(spans[owner], 1)
+
+        order = np.argsort(cell, kind='stable')
+        self.cell_rectangles = owner[order]
+        self.cell_start = np.zeros(self.columns * self.rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cell, minlength=self.columns * self.rows), out=self.cell_start[1:])
+
+    def candidates(self, x, y):
+        """Method to get the rectangles that may contain a given point (x,y)
+
+        Keyword arguments:
+        :param x,y -- coordinates of the point
+        :return list -- the rectangles registered in the cell of the point
+        """
+        cell = int(self._row(y)) * self.columns + int(self._column(x))
+        return [self.rectangles[i] for i in self.cell_rectangles[self.cell_start[cell]:self.cell_start[cell + 1]]]
+
+    def covered(self, x, y):
+        """Method to determine for a batch of points which of them lie inside at least one embedded rectangle
+
+        Keyword arguments:
+        :param x,y -- NumPy arrays with the coordinates of the points to check
+        :return numpy.ndarray -- boolean mask, True where the point is covered by a rectangle
+        """
+        cell = self._row(y) * self.columns + self._column(x)
+        start = self.cell_start[cell]
+        counts = self.cell_start[cell + 1] - start
+
+        # test every point only against the rectangles of its own cell
+        point = np.repeat(np.arange(len(x)), counts)
+        rect = self.cell_rectangles[np.repeat(start - np.cumsum(counts) + counts, counts) + np.arange(len(point))]
+        px, py = x[point], y[point]
+        hit = (self.x0[rect] <= px) & (px <= self.x1[rect]) & (self.y0[rect] <= py) & (py <= self.y1[rect])
+        return np.bincount(point[hit], minlength=len(x)) > 0
+
+    def _column(self, x):
+        return np.clip(np.floor(np.asarray(x) / self.cell_length), 0, self.columns - 1).astype(np.int64)
+
+    def _row(self, y):
+        return np.clip(np.floor(np.asarray(y) / self.cell_width), 0, self.rows - 1).astype(np.int64)
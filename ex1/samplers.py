@@ -0,0 +1,85 @@
+from math import isqrt
+
+import numpy as np
+
+
+class UniformSampler:
+    """Independent, uniformly distributed points (plain Monte Carlo)."""
+
+    # the points of a chunk are independent, so the binomial standard error applies within a chunk
+    iid = True
+
+    def sample(self, rng, size):
+        """Method to draw points in the unit square
+
+        Keyword arguments:
+        :param rng -- numpy.random.Generator the points are drawn from
+        :param size -- number of points
+        :return tuple -- two NumPy arrays with the x and y coordinates in [0, 1)
+        """
+        return rng.random(size), rng.random(size)
+
+
+class StratifiedSampler:
+    """Jittered grid: one uniform point in every cell of a k x k grid, the remaining points uniform."""
+
+    iid = False
+
+    def sample(self, rng, size):
+        k = isqrt(size)
+        cells = np.arange(k * k)
+        x = np.concatenate(((cells % k + rng.random(k * k)) / max(k, 1), rng.random(size - k * k)))
+        y = np.concatenate(((cells // k + rng.random(k * k)) / max(k, 1), rng.random(size - k * k)))
+        return x, y
+
+
+class LatinHypercubeSampler:
+    """Latin hypercube: every one of the size rows and columns of the unit square holds exactly one point."""
+
+    iid = False
+
+    def sample(self, rng, size):
+        return (rng.permutation(size) + rng.random(size)) / size, (rng.permutation(size) + rng.random(size)) / size
+
+
+class HaltonSampler:
+    """Halton sequence in bases 2 and 3, randomized with a random shift modulo 1 per chunk."""
+
+    iid = False
+
+    def sample(self, rng, size):
+        index = np.arange(1, size + 1)
+        return (self._radical_inverse(index, 2) + rng.random()) % 1.0, (self._radical_inverse(index, 3) + rng.random()) % 1.0
+
+    def _radical_inverse(self, index, base):
+        result, factor = np.zeros(len(index)), 1.0
+        while index.any():
+            factor /= base
+            result += factor * (index % base)
+            index = index // base
+        return result
+
+
+class SobolSampler:
+    """Two-dimensional Sobol sequence, randomized with a random digital shift per chunk."""
+
+    iid = False
+
+    BITS = 32
+
+    def __init__(self):
+        # direction numbers: van der Corput in x, primitive polynomial x + 1 in y
+        self.directions_x = [1 << (self.BITS - 1 - bit) for bit in range(self.BITS)]
+        self.directions_y = [1 << (self.BITS - 1)]
+        for _ in range(self.BITS - 1): self.directions_y.append(self.directions_y[-1] ^ (self.directions_y[-1] >> 1))
+
+    def sample(self, rng, size):
+        index = np.arange(size, dtype=np.uint64)
+        x, y = np.zeros(size, dtype=np.uint64), np.zeros(size, dtype=np.uint64)
+        for bit in range(max(1, size - 1).bit_length()):
+            selected = (index >> np.uint64(bit)) & np.uint64(1) == 1
+            x[selected] ^= np.uint64(self.directions_x[bit])
+            y[selected] ^= np.uint64(self.directions_y[bit])
+        x ^= rng.integers(0, 1 << self.BITS, dtype=np.uint64)
+        y ^= rng.integers(0, 1 << self.BITS, dtype=np.uint64)
+        return x / float(1 << self.BITS), y / float(1 << self.BITS)
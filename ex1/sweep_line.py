@@ -0,0 +1,70 @@
+class CoverageTree:
+
+    def __init__(self, coordinates):
+        """constructor, segment tree over the elementary intervals between consecutive sorted coordinates
+
+        Keyword arguments:
+        :param coordinates -- sorted, distinct coordinates bounding the elementary intervals
+        """
+        self.coordinates = coordinates
+        size = 4 * max(1, len(coordinates) - 1)
+        self.count = [0] * size  # number of intervals covering the whole node
+        self.covered = [0.0] * size  # covered length below the node
+
+    def add(self, lo, hi, delta):
+        """Method to add (delta = 1) or remove (delta = -1) the interval between coordinates[lo] and coordinates[hi]
+        """
+        self._update(1, 0, len(self.coordinates) - 1, lo, hi, delta)
+
+    def covered_length(self):
+        """:return float -- length covered by at least one interval"""
+        return self.covered[1]
+
+    def _update(self, node, left, right, lo, hi, delta):
+        if hi <= left or right <= lo: return
+        if lo <= left and right <= hi:
+            self.count[node] += delta
+        else:
+            middle = (left + right) // 2
+            self._update(2 * node, left, middle, lo, hi, delta)
+            self._update(2 * node + 1, middle, right, lo, hi, delta)
+
+        if self.count[node] > 0:
+            self.covered[node] = self.coordinates[right] - self.coordinates[left]
+        elif right - left == 1:
+            self.covered[node] = 0.0
+        else:
+            self.covered[node] = self.covered[2 * node] + self.covered[2 * node + 1]
+
+
+def covered_area(length, width, rectangles):
+    """Function to compute the exact area of the enclosing rectangle covered by the embedded rectangles,
+    sweeping a line over x and keeping the covered length in y in a segment tree (O(n log n))
+
+    Keyword arguments:
+    :param length -- length of the enclosing rectangle
+    :param width -- width of the enclosing rectangle
+    :param rectangles -- array that contains the embedded rectangles
+    :return float -- the covered area
+    """
+    events, ys = [], set()
+    for rect in rectangles:
+        x0, x1 = max(rect.origin_x, 0), min(rect.origin_x + rect.length, length)
+        y0, y1 = max(rect.origin_y, 0), min(rect.origin_y + rect.width, width)
+        if x0 >= x1 or y0 >= y1: continue
+        events.append((x0, 1, y0, y1))
+        events.append((x1, -1, y0, y1))
+        ys.update((y0, y1))
+    if not events: return 0.0
+
+    ys = sorted(ys)
+    index = {y: i for i, y in enumerate(ys)}
+    tree = CoverageTree(ys)
+    events.sort()
+
+    area, last_x = 0.0, events[0][0]
+    for x, delta, y0, y1 in events:
+        area += tree.covered_length() * (x - last_x)
+        tree.add(index[y0], index[y1], delta)
+        last_x = x
+    return area
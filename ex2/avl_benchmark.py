@@ -0,0 +1,114 @@
+import os
+import sys
+import tempfile
+import tracemalloc
+from random import sample, seed
+from threading import Event, Thread
+from time import perf_counter, sleep
+
+from avl_snapshot import SnapshotView
+from avl_tree import AVLTree
+from concurrent_avl_tree import ConcurrentAVLTree
+from compact_avl_tree import CompactAVLTree
+
+
+def timed(function, *args):
+    start = perf_counter()
+    result = function(*args)
+    return result, perf_counter() - start
+
+
+def build(keys, tree_class=AVLTree):
+    tree = tree_class()
+    for key in keys:
+        tree.insert(key, key)
+    return tree
+
+
+def footprint(tree_class, keys):
+    """Builds a tree and reports the memory allocated for it, in bytes per key."""
+    tracemalloc.start()
+    tree = build(keys, tree_class)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return tree, allocated / len(keys)
+
+
+def lookup(tree, keys):
+    for key in keys:
+        tree.find_by_key(key)
+
+
+def churn(tree, keys, fresh):
+    # alternately remove an existing key and insert a new one
+    for old, new in zip(keys, fresh):
+        tree.remove_by_key(old)
+        tree.insert(new, new)
+
+
+def concurrent_reads(tree, keys, readers, seconds=2.0):
+    """Runs reader threads doing lookups while one writer keeps inserting and removing keys.
+    :return Total lookups per second over all readers.
+    """
+    done, counts = Event(), [0] * readers
+
+    def read(slot):
+        while not done.is_set():
+            for key in keys[:1000]:
+                tree.find_by_key(key)
+            counts[slot] += 1000
+
+    def write():
+        key = -1
+        while not done.is_set():
+            tree.insert(key, key)
+            tree.remove_by_key(key)
+            key -= 1
+
+    threads = [Thread(target=read, args=(slot,)) for slot in range(readers)] + [Thread(target=write)]
+    for thread in threads: thread.start()
+    sleep(seconds)
+    done.set()
+    for thread in threads: thread.join()
+    return sum(counts) / seconds
+
+
+def main(size):
+    seed(0)
+    keys = sample(range(10 * size), size)
+
+    tree, elapsed = timed(build, keys)
+    print(f'build {size:,} keys:   {elapsed:8.2f} s  (height {tree.get_tree_height()})')
+    _, elapsed = timed(lookup, tree, keys)
+    print(f'lookups:            {size / elapsed:12,.0f} /s')
+
+    _, elapsed = timed(AVLTree.from_sorted, [(key, key) for key in sorted(keys)])
+    print(f'from_sorted:        {elapsed:8.2f} s')
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'tree.avls')
+        tree.save(path)
+        _, elapsed = timed(AVLTree.load, path)
+        print(f'load snapshot:      {elapsed:8.2f} s')
+        view, elapsed = timed(SnapshotView, path)
+        print(f'map snapshot:       {elapsed:8.4f} s')
+        view.close()
+
+    for tree_class in (AVLTree, CompactAVLTree):
+        layout, per_key = footprint(tree_class, keys)
+        _, elapsed = timed(lookup, layout, keys)
+        print(f'{tree_class.__name__:15}     {per_key:8.1f} bytes/key  {size / elapsed:12,.0f} lookups/s')
+    del layout
+
+    shared = ConcurrentAVLTree()
+    for key in keys: shared.insert(key, key)
+    for readers in (1, 2, 4, 8):
+        print(f'{readers} reader(s) + 1 writer: {concurrent_reads(shared, keys, readers):12,.0f} lookups/s')
+
+    fresh = [key + 10 * size for key in keys]
+    _, elapsed = timed(churn, tree, keys, fresh)
+    print(f'mixed updates:      {2 * size / elapsed:12,.0f} /s  (height {tree.get_tree_height()})')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6)
@@ -0,0 +1,118 @@
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+
+# file layout (little-endian): header, then n keys (int64), n values (int64) and n heights (int8), all in key order
+MAGIC = b'AVLS'
+VERSION = 1
+HEADER = struct.Struct('<4sBxxxQ')
+
+
+def write_snapshot(path, keys, values, heights):
+    """Writes key/value pairs in ascending key order, together with the height of their node, to a snapshot file.
+    :param path: Path of the file to write.
+    :param keys: Keys in ascending order.
+    :param values: Values belonging to the keys.
+    :param heights: Heights of the nodes holding the keys.
+    :raises ValueError if a key or value is not a 64-bit integer.
+    """
+    try:
+        columns = [array('q', keys), array('q', values), array('b', heights)]
+    except (TypeError, OverflowError) as error:
+        raise ValueError('Snapshots only hold 64-bit integer keys and values') from error
+    if sys.byteorder == 'big':
+        for column in columns: column.byteswap()
+
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(columns[0])))
+        for column in columns: column.tofile(file)
+
+
+def read_snapshot(path):
+    """Reads a snapshot file written by write_snapshot.
+    :param path: Path of the file to read.
+    :return Tuple of the keys, values and heights as arrays, in ascending key order.
+    :raises ValueError if the file is not a snapshot.
+    """
+    with open(path, 'rb') as file:
+        count = read_header(file.read(HEADER.size))
+        columns = []
+        for typecode in 'qqb':
+            column = array(typecode)
+            column.frombytes(file.read(count * column.itemsize))
+            if len(column) != count: raise ValueError('Snapshot file is truncated')
+            columns.append(column)
+    if sys.byteorder == 'big':
+        for column in columns: column.byteswap()
+    return tuple(columns)
+
+
+def read_header(data):
+    if len(data) != HEADER.size:
+        raise ValueError('Not an AVL snapshot')
+    magic, version, count = HEADER.unpack(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('Not an AVL snapshot')
+    return count
+
+
+class SnapshotView:
+    """Read-only view of a snapshot file through a memory map. Opening it costs O(1) regardless of the
+    number of keys; lookups binary-search the mapped key column in O(log n).
+    """
+
+    def __init__(self, path):
+        """Opens and maps the snapshot file.
+        :param path: Path of the snapshot file.
+        :raises ValueError if the file is not a snapshot.
+        """
+        if sys.byteorder == 'big':
+            raise ValueError('Snapshot files can only be mapped on little-endian machines')
+        with open(path, 'rb') as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.size = read_header(self.map[:HEADER.size])
+        if len(self.map) < HEADER.size + 17 * self.size:
+            raise ValueError('Snapshot file is truncated')
+        self.data = memoryview(self.map)
+        self.keys = self.data[HEADER.size:HEADER.size + 8 * self.size].cast('q')
+        self.values = self.data[HEADER.size + 8 * self.size:HEADER.size + 16 * self.size].cast('q')
+
+    def get_tree_size(self):
+        """:return Number of key/value pairs in the snapshot."""
+        return self.size
+
+    def find_by_key(self, key):
+        """Returns value of the pair with given key.
+        :param key: Key to search.
+        :return Corresponding value if key was found, None otherwise.
+        :raises ValueError if the key is None
+        """
+        if key is None:
+            raise ValueError('Key for finding is None')
+        i = bisect_left(self.keys, key)
+        return self.values[i] if i < self.size and self.keys[i] == key else None
+
+    def range(self, lo=None, hi=None):
+        """Lazily yields the key/value pairs with lo <= key <= hi in ascending key order.
+        :param lo: Lower bound (inclusive), None for no lower bound.
+        :param hi: Upper bound (inclusive), None for no upper bound.
+        :return Generator of (key, value) tuples.
+        """
+        start = 0 if lo is None else bisect_left(self.keys, lo)
+        stop = self.size if hi is None else bisect_right(self.keys, hi)
+        for i in range(start, stop):
+            yield self.keys[i], self.values[i]
+
+    def close(self):
+        self.keys.release()
+        self.values.release()
+        self.data.release()
+        self.map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
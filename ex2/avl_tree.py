@@ -1,4 +1,5 @@
 from avl_node import AVLNode
+from avl_snapshot import read_snapshot, write_snapshot
 
 
 class AVLTree:
@@ -7,6 +8,70 @@ class AVLTree:
         """Default constructor. Initializes the AVL tree.
         """
         self.root = None
+        self.size = 0
+
+    @classmethod
+    def from_sorted(cls, items):
+        """Builds a perfectly balanced AVL tree from key/value pairs in a single O(n) pass.
+        :param items: Iterable of (key, value) tuples in strictly ascending key order.
+        :return The new AVLTree.
+        :raises ValueError if a key or value is None or the keys are not strictly ascending.
+        """
+        items = list(items)
+        for i, (key, value) in enumerate(items):
+            if key is None or value is None:
+                raise ValueError('Key or Value is None')
+            if i > 0 and not items[i - 1][0] < key:
+                raise ValueError('Keys are not strictly ascending in from_sorted')
+
+        tree = cls()
+        tree.root = tree.build_balanced(items, 0, len(items), None)
+        tree.size = len(items)
+        return tree
+
+    @classmethod
+    def load(cls, path):
+        """Loads a tree written by save. The stored heights determine the shape of the tree (the root of
+        every subtree is the unique highest node of its key range), so the saved tree is restored
+        exactly in a single O(n) pass without any rebalancing.
+        :param path: Path of the snapshot file.
+        :return The loaded AVLTree.
+        :raises ValueError if the file is not a snapshot.
+        """
+        keys, values, heights = read_snapshot(path)
+        tree = cls()
+        stack = []  # right spine of the part built so far, heights decreasing towards the top
+        for key, value, height in zip(keys, values, heights):
+            node = tree.create_node(key, value)
+            node.height = height
+            last = None
+            while stack and stack[-1].height < height:
+                last = stack.pop()
+                last.size = tree.get_size(last.left) + tree.get_size(last.right) + 1
+            node.left = last
+            if last is not None:
+                last.parent = node
+            if stack:
+                stack[-1].right = node
+                node.parent = stack[-1]
+            stack.append(node)
+        while stack:
+            last = stack.pop()
+            last.size = tree.get_size(last.left) + tree.get_size(last.right) + 1
+
+        tree.root = last if keys else None
+        tree.size = len(keys)
+        return tree
+
+    def save(self, path):
+        """Writes the tree to a binary snapshot file: the key/value pairs in ascending key order together
+        with the height of their node. Load it with load, or map it read-only with avl_snapshot.SnapshotView.
+        :param path: Path of the file to write.
+        :raises ValueError if a key or value is not a 64-bit integer.
+        """
+        nodes = list(self.nodes_inorder(self.root))
+        write_snapshot(path, [node.key for node in nodes], [node.value for node in nodes],
+                       [node.height for node in nodes])
 
     def get_tree_root(self):
         """
@@ -25,7 +90,7 @@ class AVLTree:
         """Yields number of key/value pairs in the tree.
         :return Number of key/value pairs.
         """
-        return len(self.to_array())
+        return self.size
 
     def to_array(self):
         """Yields an array representation of the tree's values (pre-order).
@@ -46,9 +111,78 @@ class AVLTree:
         if key is None:
             return ValueError('Key for finding is None')
 
-        for node in self.to_array_nodes():
-            if node.key == key: return node.value
-        return None
+        node = self.find_node(key)
+        return None if node is None else node.value
+
+    def select(self, k):
+        """Returns the k-th smallest key, counting from 0.
+        :param k: Position of the key in sorted order.
+        :return The key with exactly k smaller keys in the tree.
+        :raises ValueError if k is None or not in range(get_tree_size()).
+        """
+        if k is None or not 0 <= k < self.size:
+            raise ValueError('k is None or out of range in select')
+
+        node = self.root
+        while True:
+            left_size = self.get_size(node.left)
+            if k == left_size:
+                return node.key
+            if k < left_size:
+                node = node.left
+            else:
+                k -= left_size + 1
+                node = node.right
+
+    def rank(self, key):
+        """Returns the number of keys smaller than the given key. The key itself need not be in the tree.
+        :param key: Key to rank.
+        :return Number of keys in the tree that are smaller than key.
+        :raises ValueError if the key is None.
+        """
+        if key is None:
+            raise ValueError('Key is None in rank')
+        return self.count_smaller(key, False)
+
+    def count_range(self, lo, hi):
+        """Returns the number of keys k with lo <= k <= hi.
+        :param lo: Lower bound (inclusive).
+        :param hi: Upper bound (inclusive).
+        :return Number of keys in the range, 0 if lo > hi.
+        :raises ValueError if lo or hi is None.
+        """
+        if lo is None or hi is None:
+            raise ValueError('Bound is None in count_range')
+        if hi < lo:
+            return 0
+        return self.count_smaller(hi, True) - self.count_smaller(lo, False)
+
+    def range(self, lo=None, hi=None):
+        """Lazily yields the key/value pairs with lo <= key <= hi in ascending key order.
+        The first pair is found in O(log n), every further one in amortized O(1). The tree must not be
+        modified while the generator is in use.
+        :param lo: Lower bound (inclusive), None for no lower bound.
+        :param hi: Upper bound (inclusive), None for no upper bound.
+        :return Generator of (key, value) tuples.
+        """
+        # seek: the stack holds the ancestors of lo's position that are still to be visited
+        stack, node = [], self.root
+        while node is not None:
+            if lo is None or node.key >= lo:
+                stack.append(node)
+                node = node.left
+            else:
+                node = node.right
+
+        while stack:
+            node = stack.pop()
+            if hi is not None and node.key > hi:
+                return
+            yield node.key, node.value
+            node = node.right
+            while node is not None:
+                stack.append(node)
+                node = node.left
 
     def insert(self, key, value):
         """Inserts a new node into AVL tree.
@@ -59,35 +193,65 @@ class AVLTree:
         :return True if the insert was successful, False otherwise.
         :raises ValueError if the key or value is None.
         """
-        if self.find_node(key) is not None: return False
         if key is None or value is None: raise ValueError('Key or Value is None')
 
-        new = AVLNode(key, value)
-
         if self.root is None:
-            self.root = new
+            self.root = self.create_node(key, value)
+            self.size = 1
             return True
 
         node = self.root
-
         while True:
-            if new.key < node.key and node.left is None:
-                new.parent = node
-                node.left = new
-                if node.right is None:
-                    self.height_REFRASHER(new)
-                self.if_same_height(new)
-                return True
-
-            if new.key > node.key and node.right is None:
-                new.parent = node
-                node.right = new
-                if node.left is None:
-                    self.height_REFRASHER(new)
-                self.if_same_height(new)
-                return True
-
-            node = node.left if new.key < node.key else node.right
+            if key == node.key: return False
+            child = node.left if key < node.key else node.right
+            if child is None: break
+            node = child
+
+        new = self.create_node(key, value)
+        new.parent = node
+        if key < node.key:
+            node.left = new
+        else:
+            node.right = new
+        self.size += 1
+        self.rebalance(node)
+        return True
+
+    def insert_many(self, items):
+        """Inserts a batch of key/value pairs. Keys that are already in the tree, or repeated within the
+        batch, are skipped like in insert. Large batches are sorted and merged with the keys of the tree,
+        which is then rebuilt balanced in O(n + m log m); small ones are inserted one by one.
+        :param items: Iterable of (key, value) tuples in any order.
+        :return Number of inserted pairs.
+        :raises ValueError if a key or value is None.
+        """
+        items = list(items)
+        for key, value in items:
+            if key is None or value is None:
+                raise ValueError('Key or Value is None')
+
+        if len(items) * max(1, self.get_tree_height()) < self.size:
+            return sum(self.insert(key, value) for key, value in items)
+
+        # stable sort, so the first of several pairs with the same key wins like with insert
+        batch = sorted(items, key=lambda item: item[0])
+        merged, existing = [], self.range()
+        current = next(existing, None)
+        for key, value in batch:
+            while current is not None and current[0] < key:
+                merged.append(current)
+                current = next(existing, None)
+            if current is not None and current[0] == key or merged and merged[-1][0] == key:
+                continue
+            merged.append((key, value))
+        if current is not None:
+            merged.append(current)
+            merged.extend(existing)
+
+        inserted = len(merged) - self.size
+        self.root = self.build_balanced(merged, 0, len(merged), None)
+        self.size = len(merged)
+        return inserted
 
     def remove_by_key(self, key):
         """Removes node with given key.
@@ -106,131 +270,22 @@ class AVLTree:
         if node is None:
             return False
 
-        p = node.parent
-        r_kid = node.right
-        l_kid = node.left
-
-        if node != self.root:
-
-            if l_kid is None and r_kid is None:
-                if node.key < p.key:
-                    p.left = None
-                    c = p
-                    while c.right is not None:
-                        c = c.right
-                    self.if_same_height(c)
-                else:
-                    p.right = None
-                    c = p
-                    while c.left is not None:
-                        c = c.left
-                    self.if_same_height(c)
-                self.refrash_all()
-                return True
-
-            if l_kid is not None and r_kid is not None:
-
-                if r_kid.left is None:
-                    r_kid.parent = None
-                    r_kid.left = l_kid
-                    l_kid.parent = r_kid
-                    self.if_same_height(p)
-                    return True
-                if l_kid.right is None:
-                    l_kid.parent = p
-                    l_kid.right = r_kid
-                    r_kid.parent = l_kid
-                    p.left = l_kid if node.key <= p.key else p.right
-                    self.if_same_height(p)
-                    return True
-
-                l_r_child = r_kid
-                while l_r_child.left is not None:
-                    l_r_child = l_r_child.left
-                change_node = l_r_child
-                change_node.parent.left = change_node.right
-                change_node.parent = p
-                change_node.left = node.left
-                change_node.right = node.right
-                node.left.parent = change_node
-                node.right.parent = change_node
-
-                if node.key <= p.key:
-                    p.left = change_node
-                else:
-                    p.right = change_node
-                self.if_same_height(p)
-                return True
-
-            if l_kid is not None:
-                l_kid.parent = p
-                if p.key >= node.key:
-                    p.left = l_kid
-                else:
-                    p.right = l_kid
-                self.if_same_height(p)
-                self.refrash_all()
-                return True
-
-            if r_kid is not None:
-                r_kid.parent = p
-                if p.key >= node.key:
-                    p.left = r_kid
-                else:
-                    p.right = r_kid
-                self.if_same_height(self.root)
-                return True
-        else:
-
-            if l_kid is None and r_kid is None:
-                self.root = None
-                self.if_same_height(self.root)
-                return True
-
-            if l_kid is not None and r_kid is not None:
-
-                if r_kid.left is None:
-                    b_control = r_kid.parent
-                    r_kid.parent = None
-                    r_kid.left = l_kid
-                    l_kid.parent = r_kid
-                    self.root = r_kid
-                    self.if_same_height(b_control)
-                    return True
-                if l_kid.right is None:
-                    b_control = r_kid.parent
-                    l_kid.parent = None
-                    l_kid.right = r_kid
-                    r_kid.parent = l_kid
-                    self.root = l_kid
-                    self.if_same_height(b_control)
-                    return True
-
-                l_r_child = r_kid
-                while l_r_child.left is not None:
-                    l_r_child = l_r_child.left
-                change_node = l_r_child
-                change_node.parent.left = change_node.right
-                b_control = change_node.parent
-                change_node.parent = None
-                change_node.left = node.left
-                change_node.right = node.right
-                l_kid.parent = change_node
-                r_kid.parent = change_node
-                self.root = change_node
-                self.if_same_height(b_control)
-                return True
-
-            if r_kid is not None:
-                self.root = r_kid
-                self.if_same_height(r_kid.parent)
-                r_kid.parent = None
-                return True
-            if l_kid is not None:
-                self.root = l_kid
-                self.if_same_height(l_kid.parent)
-                l_kid.parent = None
-                return True
+        if node.left is not None and node.right is not None:
+            # the in-order successor takes over the key/value, its own node is removed instead
+            successor = node.right
+            while successor.left is not None:
+                successor = successor.left
+            node.key, node.value = successor.key, successor.value
+            node = successor
+
+        child = node.left if node.left is not None else node.right
+        parent = node.parent
+        if child is not None:
+            child.parent = parent
+        self.replace_child(parent, node, child)
+        self.size -= 1
+        self.rebalance(parent)
+        return True
 
     def to_array_nodes(self):
         n = self.root
@@ -239,73 +294,112 @@ class AVLTree:
             a.append(n)
         return a
 
-    def refrash_all(self):
-        for n in self.to_array_nodes():
-            n.height = 0
-        for n in self.to_array_nodes():
-            current = n
-            while current.parent is not None:
-                p_left = current.parent.left
-                p_right = current.parent.right
-                p_left = -1 if p_left is None else p_left.height
-                p_right = -1 if p_right is None else p_right.height
-                current.parent.height = max(p_left, p_right) + 1
-                current = current.parent
-
-    def height_REFRASHER(self, node):
-        now = node
-        while now.parent is not None:
-            now.parent.height = now.height + 1
-            now = now.parent
-        self.root = now
-
-    def if_same_height(self, curr):
-        while curr is not None:
-            try:
-                gparent = curr.parent.parent
-                if gparent is None:
-                    p_subtree = None
-                    gparent = curr.parent
-                    left_height = -1 if gparent.left is None else gparent.left.height
-                    right_height = -1 if gparent.right is None else gparent.right.height
-
-                    if abs(left_height - right_height) > 1:
-                        self.restructure(curr, curr.parent, gparent, p_subtree, left)
-                else:
-                    p_subtree = gparent.parent
-                if p_subtree is not None:
-                    left = True if p_subtree.left is gparent else False
-                left_height = -1 if gparent.left is None else gparent.left.height
-                right_height = -1 if gparent.right is None else gparent.right.height
-                if abs(left_height - right_height) > 1:
-                    self.restructure(curr, curr.parent, gparent, p_subtree, left)
-            except:
-                pass
-            curr = curr.parent
-
     def find_node(self, key):
         if key is None:
             raise ValueError('Key in find_node is None')
-        for node in self.to_array_nodes():
-            if node.key is key:
-                return node
-        return None
-
-    def not_the_same(self, node):
-        return True if abs(node.left - node.right) > 1 else False
+        node = self.root
+        while node is not None and node.key != key:
+            node = node.left if key < node.key else node.right
+        return node
+
+    def build_balanced(self, items, lo, hi, parent):
+        if lo >= hi:
+            return None
+        middle = (lo + hi) // 2
+        node = self.create_node(*items[middle])
+        node.parent = parent
+        node.left = self.build_balanced(items, lo, middle, node)
+        node.right = self.build_balanced(items, middle + 1, hi, node)
+        self.update_height(node)
+        return node
+
+    def count_smaller(self, key, inclusive):
+        count, node = 0, self.root
+        while node is not None:
+            if node.key < key or inclusive and node.key == key:
+                count += self.get_size(node.left) + 1
+                node = node.right
+            else:
+                node = node.left
+        return count
 
     def get_key(self, node):
         return node.key
 
-    def nodes_preorder(self, node):
-        if not node:
-            return iter(())
+    def create_node(self, key, value):
+        node = AVLNode(key, value)
+        node.size = 1  # number of nodes in the subtree rooted at this node
+        return node
+
+    def get_height(self, node):
+        return -1 if node is None else node.height
+
+    def get_size(self, node):
+        return 0 if node is None else node.size
+
+    def update_height(self, node):
+        node.height = max(self.get_height(node.left), self.get_height(node.right)) + 1
+        node.size = self.get_size(node.left) + self.get_size(node.right) + 1
 
-        yield node
-        yield from self.nodes_preorder(node.left)
-        yield from self.nodes_preorder(node.right)
+    def taller_child(self, node, same_side):
+        left, right = self.get_height(node.left), self.get_height(node.right)
+        if left == right:
+            # on a tie keep the side of the parent, so the single rotation is used
+            return node.left if same_side else node.right
+        return node.left if left > right else node.right
 
-    def restructure(self, a, b, c, p_subtree, left):
+    def nodes_preorder(self, node):
+        stack = [node] if node else []
+        while stack:
+            node = stack.pop()
+            yield node
+            if node.right is not None: stack.append(node.right)
+            if node.left is not None: stack.append(node.left)
+
+    def nodes_inorder(self, node):
+        stack = []
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node
+            node = node.right
+
+    def replace_child(self, parent, old, new):
+        if parent is None:
+            self.root = new
+        elif parent.left is old:
+            parent.left = new
+        else:
+            parent.right = new
+
+    def rebalance(self, node):
+        """Updates the heights and subtree sizes on the path from node up to the root and restructures every
+        unbalanced node on the way. Only this path can have changed, so insert and remove stay O(log n).
+        :param node: Lowest node whose subtree has changed, may be None.
+        """
+        while node is not None:
+            old_height = node.height
+            self.update_height(node)
+            if abs(self.get_height(node.left) - self.get_height(node.right)) > 1:
+                y = self.taller_child(node, True)
+                x = self.taller_child(y, y is node.left)
+                node = self.restructure(x, y, node)
+            elif node.height == old_height:
+                break
+            node = node.parent
+
+        # the heights above are unchanged, only the subtree sizes are left
+        while node is not None and node.parent is not None:
+            node = node.parent
+            node.size = self.get_size(node.left) + self.get_size(node.right) + 1
+
+    def restructure(self, a, b, c):
+        """Trinode restructuring of a node c, its taller child b and b's taller child a.
+        :return The node that is now the root of the restructured subtree.
+        """
+        p_subtree = c.parent
         first, second, third = sorted([a, b, c], key=self.get_key)
         B = [first.left, first.right, second.left, second.right, third.left, third.right]
         for xy in [first, second, third]:
@@ -314,6 +408,8 @@ class AVLTree:
             except ValueError:
                 pass
 
+        self.replace_child(p_subtree, c, second)
+        second.parent = p_subtree
         second.left = first
         first.parent = second
         second.right = third
@@ -325,19 +421,8 @@ class AVLTree:
         if B[0] is not None: B[0].parent = first
         if B[1] is not None: B[1].parent = first
         if B[2] is not None: B[2].parent = third
-        if B[2] is not None: B[2].parent = third
-        _0_height = -1 if B[0] is None else B[0].height
-        _1_height = -1 if B[1] is None else B[1].height
-        _2_height = -1 if B[2] is None else B[2].height
-        _3_height = -1 if B[3] is None else B[3].height
-        first.height = max(_0_height, _1_height) + 1
-        third.height = max(_2_height, _3_height) + 1
-        second.height = max(first.height, third.height) + 1
-        second.parent = p_subtree
-        self.height_REFRASHER(second)
-        if p_subtree is not None:
-            if left:
-                p_subtree.left = second
-            else:
-                p_subtree.right = second
-        self.refrash_all()
+        if B[3] is not None: B[3].parent = third
+        self.update_height(first)
+        self.update_height(third)
+        self.update_height(second)
+        return second
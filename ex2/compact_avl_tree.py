@@ -0,0 +1,206 @@
+from array import array
+
+NIL = -1
+
+
+class CompactAVLTree:
+    """AVL tree for integer keys that keeps its nodes in parallel arrays instead of AVLNode objects.
+    Node i is described by keys[i], values[i], heights[i], left[i] and right[i]; NIL marks a missing child.
+    Slots of removed nodes are chained into a free list through the left array and reused by insert.
+    """
+
+    def __init__(self):
+        """Default constructor. Initializes the AVL tree.
+        """
+        self.keys = array('q')
+        self.values = []
+        self.heights = array('b')
+        self.left = array('i')
+        self.right = array('i')
+        self.root = NIL
+        self.free = NIL
+        self.size = 0
+
+    def get_tree_height(self):
+        """Retrieves tree height.
+        :return -1 in case of empty tree, current tree height otherwise.
+        """
+        return self.get_height(self.root)
+
+    def get_tree_size(self):
+        """Yields number of key/value pairs in the tree.
+        :return Number of key/value pairs.
+        """
+        return self.size
+
+    def find_by_key(self, key):
+        """Returns value of node with given key.
+        :param key: Key to search.
+        :return Corresponding value if key was found, None otherwise.
+        :raises ValueError if the key is None
+        """
+        if key is None:
+            raise ValueError('Key for finding is None')
+        keys, left, right = self.keys, self.left, self.right
+        i = self.root
+        while i != NIL:
+            node_key = keys[i]
+            if key == node_key:
+                return self.values[i]
+            i = left[i] if key < node_key else right[i]
+        return None
+
+    def insert(self, key, value):
+        """Inserts a new node into AVL tree. Nodes with the same key are not allowed.
+        :param key: Integer key of the new node.
+        :param value: Data of the new node.
+        :return True if the insert was successful, False otherwise.
+        :raises ValueError if the key or value is None.
+        """
+        if key is None or value is None: raise ValueError('Key or Value is None')
+
+        path, i = [], self.root
+        while i != NIL:
+            if key == self.keys[i]: return False
+            path.append(i)
+            i = self.left[i] if key < self.keys[i] else self.right[i]
+
+        new = self.create_node(key, value)
+        if not path:
+            self.root = new
+        elif key < self.keys[path[-1]]:
+            self.left[path[-1]] = new
+        else:
+            self.right[path[-1]] = new
+        self.size += 1
+        self.rebalance(path)
+        return True
+
+    def remove_by_key(self, key):
+        """Removes node with given key.
+        :param key: Key of node to remove.
+        :return True If node was found and deleted, False otherwise.
+        :raises ValueError if the key is None or not an integer.
+        """
+        if key is None or not isinstance(key, int):
+            raise ValueError('Key is None or not an integer in remove_by_key')
+
+        path, i = [], self.root
+        while i != NIL and self.keys[i] != key:
+            path.append(i)
+            i = self.left[i] if key < self.keys[i] else self.right[i]
+        if i == NIL:
+            return False
+
+        if self.left[i] != NIL and self.right[i] != NIL:
+            # the in-order successor takes over the key/value, its own slot is removed instead
+            path.append(i)
+            successor = self.right[i]
+            while self.left[successor] != NIL:
+                path.append(successor)
+                successor = self.left[successor]
+            self.keys[i], self.values[i] = self.keys[successor], self.values[successor]
+            i = successor
+
+        child = self.left[i] if self.left[i] != NIL else self.right[i]
+        self.replace_child(path[-1] if path else NIL, i, child)
+        self.release_node(i)
+        self.size -= 1
+        self.rebalance(path)
+        return True
+
+    def range(self, lo=None, hi=None):
+        """Lazily yields the key/value pairs with lo <= key <= hi in ascending key order.
+        :param lo: Lower bound (inclusive), None for no lower bound.
+        :param hi: Upper bound (inclusive), None for no upper bound.
+        :return Generator of (key, value) tuples.
+        """
+        stack, i = [], self.root
+        while i != NIL:
+            if lo is None or self.keys[i] >= lo:
+                stack.append(i)
+                i = self.left[i]
+            else:
+                i = self.right[i]
+
+        while stack:
+            i = stack.pop()
+            if hi is not None and self.keys[i] > hi:
+                return
+            yield self.keys[i], self.values[i]
+            i = self.right[i]
+            while i != NIL:
+                stack.append(i)
+                i = self.left[i]
+
+    def create_node(self, key, value):
+        if self.free == NIL:
+            self.keys.append(key)
+            self.values.append(value)
+            self.heights.append(0)
+            self.left.append(NIL)
+            self.right.append(NIL)
+            return len(self.keys) - 1
+
+        i, self.free = self.free, self.left[self.free]
+        self.keys[i], self.values[i], self.heights[i] = key, value, 0
+        self.left[i] = self.right[i] = NIL
+        return i
+
+    def release_node(self, i):
+        self.values[i] = None
+        self.left[i], self.free = self.free, i
+
+    def get_height(self, i):
+        return -1 if i == NIL else self.heights[i]
+
+    def update_height(self, i):
+        self.heights[i] = max(self.get_height(self.left[i]), self.get_height(self.right[i])) + 1
+
+    def replace_child(self, parent, old, new):
+        if parent == NIL:
+            self.root = new
+        elif self.left[parent] == old:
+            self.left[parent] = new
+        else:
+            self.right[parent] = new
+
+    def rebalance(self, path):
+        """Updates the heights along the path of node indices from the root to the changed node,
+        bottom-up, and rotates every unbalanced node on the way.
+        :param path: Node indices from the root down to the lowest node whose subtree has changed.
+        """
+        for depth in range(len(path) - 1, -1, -1):
+            i = path[depth]
+            old_height = self.heights[i]
+            self.update_height(i)
+            balance = self.get_height(self.left[i]) - self.get_height(self.right[i])
+            if balance > 1:
+                if self.get_height(self.left[self.left[i]]) < self.get_height(self.right[self.left[i]]):
+                    self.left[i] = self.rotate_left(self.left[i])
+                top = self.rotate_right(i)
+            elif balance < -1:
+                if self.get_height(self.right[self.right[i]]) < self.get_height(self.left[self.right[i]]):
+                    self.right[i] = self.rotate_right(self.right[i])
+                top = self.rotate_left(i)
+            elif self.heights[i] == old_height:
+                return
+            else:
+                continue
+            self.replace_child(path[depth - 1] if depth > 0 else NIL, i, top)
+
+    def rotate_right(self, i):
+        top = self.left[i]
+        self.left[i] = self.right[top]
+        self.right[top] = i
+        self.update_height(i)
+        self.update_height(top)
+        return top
+
+    def rotate_left(self, i):
+        top = self.right[i]
+        self.right[i] = self.left[top]
+        self.left[top] = i
+        self.update_height(i)
+        self.update_height(top)
+        return top
@@ -0,0 +1,175 @@
+from threading import Lock
+
+
+class PersistentNode:
+    """Immutable AVL node. Nodes are never changed once published, updates copy the path they touch."""
+
+    __slots__ = ('key', 'value', 'left', 'right', 'height', 'size')
+
+    def __init__(self, key, value, left, right):
+        self.key, self.value, self.left, self.right = key, value, left, right
+        self.height = max(get_height(left), get_height(right)) + 1
+        self.size = get_size(left) + get_size(right) + 1
+
+
+def get_height(node):
+    return -1 if node is None else node.height
+
+
+def get_size(node):
+    return 0 if node is None else node.size
+
+
+class ConcurrentAVLTree:
+    """AVL tree for many reader threads and one writer at a time. Writers are serialized by a lock and build
+    a new version of the tree by copying the path from the root to the changed node (copy-on-write); the
+    new root is published with a single assignment. Readers never lock: every read starts from the root
+    that is current at that moment and sees that consistent version until it is done.
+    """
+
+    def __init__(self):
+        """Default constructor. Initializes the AVL tree.
+        """
+        self.root = None
+        self.write_lock = Lock()
+
+    def snapshot(self):
+        """Returns the current version of the tree. It stays valid and unchanged while writers go on.
+        :return PersistentNode -- the root of the current version, None if the tree is empty.
+        """
+        return self.root
+
+    def get_tree_height(self):
+        """Retrieves tree height.
+        :return -1 in case of empty tree, current tree height otherwise.
+        """
+        return get_height(self.root)
+
+    def get_tree_size(self):
+        """Yields number of key/value pairs in the tree.
+        :return Number of key/value pairs.
+        """
+        return get_size(self.root)
+
+    def find_by_key(self, key):
+        """Returns value of node with given key.
+        :param key: Key to search.
+        :return Corresponding value if key was found, None otherwise.
+        :raises ValueError if the key is None
+        """
+        if key is None:
+            raise ValueError('Key for finding is None')
+        node = self.root
+        while node is not None:
+            if key == node.key:
+                return node.value
+            node = node.left if key < node.key else node.right
+        return None
+
+    def range(self, lo=None, hi=None):
+        """Lazily yields the key/value pairs with lo <= key <= hi in ascending key order, all taken from
+        the version of the tree that is current when the iteration starts.
+        :param lo: Lower bound (inclusive), None for no lower bound.
+        :param hi: Upper bound (inclusive), None for no upper bound.
+        :return Generator of (key, value) tuples.
+        """
+        stack, node = [], self.root
+        while node is not None:
+            if lo is None or node.key >= lo:
+                stack.append(node)
+                node = node.left
+            else:
+                node = node.right
+
+        while stack:
+            node = stack.pop()
+            if hi is not None and node.key > hi:
+                return
+            yield node.key, node.value
+            node = node.right
+            while node is not None:
+                stack.append(node)
+                node = node.left
+
+    def insert(self, key, value):
+        """Inserts a new node into AVL tree. Nodes with the same key are not allowed.
+        :param key: Key of the new node.
+        :param value: Data of the new node.
+        :return True if the insert was successful, False otherwise.
+        :raises ValueError if the key or value is None.
+        """
+        if key is None or value is None: raise ValueError('Key or Value is None')
+        with self.write_lock:
+            root = self.insert_into(self.root, key, value)
+            if root is self.root:
+                return False
+            self.root = root
+            return True
+
+    def remove_by_key(self, key):
+        """Removes node with given key.
+        :param key: Key of node to remove.
+        :return True If node was found and deleted, False otherwise.
+        :raises ValueError if the key is None.
+        """
+        if key is None:
+            raise ValueError('Key is None in remove_by_key')
+        with self.write_lock:
+            root = self.remove_from(self.root, key)
+            if root is self.root:
+                return False
+            self.root = root
+            return True
+
+    def insert_into(self, node, key, value):
+        # returns node itself if the key is already there
+        if node is None:
+            return PersistentNode(key, value, None, None)
+        if key == node.key:
+            return node
+        if key < node.key:
+            left = self.insert_into(node.left, key, value)
+            return node if left is node.left else self.balance(node.key, node.value, left, node.right)
+        right = self.insert_into(node.right, key, value)
+        return node if right is node.right else self.balance(node.key, node.value, node.left, right)
+
+    def remove_from(self, node, key):
+        # returns node itself if the key is not there
+        if node is None:
+            return None
+        if key < node.key:
+            left = self.remove_from(node.left, key)
+            return node if left is node.left else self.balance(node.key, node.value, left, node.right)
+        if key > node.key:
+            right = self.remove_from(node.right, key)
+            return node if right is node.right else self.balance(node.key, node.value, node.left, right)
+
+        if node.left is None:
+            return node.right
+        if node.right is None:
+            return node.left
+        successor = node.right
+        while successor.left is not None:
+            successor = successor.left
+        right = self.remove_from(node.right, successor.key)
+        return self.balance(successor.key, successor.value, node.left, right)
+
+    def balance(self, key, value, left, right):
+        """Creates the node for key/value over the given subtrees, rotating if they differ in height by 2.
+        :return The root of the balanced subtree.
+        """
+        if get_height(left) - get_height(right) > 1:
+            if get_height(left.left) < get_height(left.right):
+                left = self.rotate_left(left.key, left.value, left.left, left.right)
+            return self.rotate_right(key, value, left, right)
+        if get_height(right) - get_height(left) > 1:
+            if get_height(right.right) < get_height(right.left):
+                right = self.rotate_right(right.key, right.value, right.left, right.right)
+            return self.rotate_left(key, value, left, right)
+        return PersistentNode(key, value, left, right)
+
+    def rotate_right(self, key, value, left, right):
+        return PersistentNode(left.key, left.value, left.left, PersistentNode(key, value, left.right, right))
+
+    def rotate_left(self, key, value, left, right):
+        return PersistentNode(right.key, right.value, PersistentNode(key, value, left, right.left), right.right)
@@ -1,25 +1,117 @@
+from io import StringIO
+
+import numpy as np
+
 from chaining_hash_node import ChainingHashNode
+from hash_strategies import modulo_hash
+
+
+MIN_CAPACITY = 8
 
 
 class ChainingHashSet():
-    def __init__(self, capacity=0):
+    def __init__(self, capacity=0, max_load_factor=None, min_load_factor=None, rehash_step=None,
+                 hash_strategy=modulo_hash):
+        """
+        :param capacity:
+        		Initial number of buckets.
+        :param max_load_factor:
+        		The table doubles once the number of keys per bucket would exceed this, None for a fixed capacity.
+        		Defaults to 1.0 for a table created without buckets, which could not store anything otherwise.
+        :param min_load_factor:
+        		The table halves (never below the initial capacity) once the number of keys per bucket drops
+        		below this, None to never shrink. Must be smaller than half of max_load_factor.
+        :param rehash_step:
+        		Number of old buckets moved to the resized table by every insert/contains/remove, so a resize is
+        		spread over many operations instead of stalling one. None to move all buckets at once. It is
+        		raised for a resize if needed so that the resize is complete before the next one starts.
+        :param hash_strategy:
+        		Function (key, capacity) -> bucket index, see hash_strategies. Defaults to the modulo division.
+        :raises:
+        		a ValueError if the load factors or the rehash step are not positive or do not fit together.
+        """
+        if max_load_factor is None and capacity == 0:
+            max_load_factor = 1.0
+        if max_load_factor is not None and max_load_factor <= 0 or rehash_step is not None and rehash_step <= 0:
+            raise ValueError
+        if min_load_factor is not None and (max_load_factor is None or not 0 < min_load_factor < max_load_factor / 2):
+            raise ValueError
+
         self.hash_table = [None] * capacity
         self.table_size = 0
         self.capacity = capacity
+        self.min_capacity = max(capacity, MIN_CAPACITY)
+        self.max_load_factor = max_load_factor
+        self.min_load_factor = min_load_factor
+        self.rehash_step = rehash_step
+        self.hash_strategy = hash_strategy
+        self.bucket_snapshot = None  # see build_bucket_snapshot, None whenever the table has changed since
+
+        # while a resize is in progress the buckets below rehash_index have been moved out of old_table
+        self.old_table = None
+        self.old_capacity = 0
+        self.rehash_index = 0
+        self.buckets_per_step = rehash_step  # rehash_step, raised if needed to finish before the next resize
 
     def get_hash_code(self, key):
-        """Hash function that calculates a hash code for a given key using the modulo division.
+        """Hash function that calculates a hash code for a given key using the hash strategy (by default the
+        modulo division).
         :param key:
         		Key for which a hash code shall be calculated according to the length of the hash table.
         :return:
         		The calculated hash code for the given key.
         """
-        return key % self.capacity
+        return self.hash_code(key, self.capacity)
+
+    def hash_code(self, key, capacity):
+        return self.hash_strategy(key, capacity)
+
+    def chain_length_histogram(self):
+        """Counts the buckets by the length of their chain, to check how evenly the keys are distributed.
+        :return:
+        		Dictionary mapping a chain length to the number of buckets with a chain of that length.
+        """
+        self.finish_rehash()
+        histogram = {}
+        for node_from_key in self.hash_table:
+            length = 0
+            while node_from_key:
+                length += 1
+                node_from_key = node_from_key.next
+            histogram[length] = histogram.get(length, 0) + 1
+        return histogram
+
+    def iter_buckets(self):
+        """Lazily yields the buckets one after another. The table must not be changed during the iteration.
+        :return:
+        		Generator of (bucket index, list of the keys in the bucket's chain) tuples.
+        """
+        self.finish_rehash()
+        for index, node_from_key in enumerate(self.hash_table):
+            keys = []
+            while node_from_key is not None:
+                keys.append(node_from_key.key)
+                node_from_key = node_from_key.next
+            yield index, keys
+
+    def bucket_statistics(self):
+        """Summarizes the chain lengths of the buckets.
+        :return:
+        		Dictionary with the longest chain ('max_chain'), the mean length of the non-empty chains
+        		('mean_chain') and the fraction of empty buckets ('empty_ratio').
+        """
+        histogram = self.chain_length_histogram()
+        empty = histogram.get(0, 0)
+        used = self.capacity - empty
+        return {'max_chain': max(histogram, default=0),
+                'mean_chain': self.table_size / used if used else 0.0,
+                'empty_ratio': empty / self.capacity if self.capacity else 0.0}
 
     def get_hash_table(self):
         """(Required for testing only)
         :return the hash table.
         """
+        self.finish_rehash()
         return self.hash_table
 
     def set_hash_table(self, table):
@@ -32,6 +124,8 @@ class ChainingHashSet():
         !!!
 
         """
+        self.old_table = None
+        self.bucket_snapshot = None
         self.hash_table = table
         self.capacity = len(table)
         self.table_size = 0
@@ -60,17 +154,23 @@ class ChainingHashSet():
         if self.contains(key):
             return False
 
+        if self.max_load_factor is not None and self.table_size + 1 > self.max_load_factor * self.capacity:
+            self.finish_rehash()
+            self.start_rehash(max(2 * self.capacity, self.min_capacity))
+
         some_hash = self.get_hash_code(key)
         node_from_key = ChainingHashNode(key)
         if self.hash_table[some_hash] is None:
             self.hash_table[some_hash] = node_from_key
             self.table_size += 1
+            self.bucket_snapshot = None
             return True
         else:
             cur_position = self.hash_table[some_hash]
             while cur_position.next: cur_position = cur_position.next
             cur_position.next = node_from_key
             self.table_size += 1
+            self.bucket_snapshot = None
             return True
 
     def contains(self, key):
@@ -84,7 +184,16 @@ class ChainingHashSet():
          """
         if key is None:
             return ValueError
-        for node_from_key in self.hash_table:
+        self.rehash_some()
+        if self.capacity == 0:
+            return False
+        node_from_key = self.hash_table[self.get_hash_code(key)]
+        while node_from_key:
+            if node_from_key.key == key: return True
+            node_from_key = node_from_key.next
+
+        if self.old_table is not None:
+            node_from_key = self.old_table[self.hash_code(key, self.old_capacity)]
             while node_from_key:
                 if node_from_key.key == key: return True
                 node_from_key = node_from_key.next
@@ -102,29 +211,255 @@ class ChainingHashSet():
         if key is None:
             raise ValueError
 
-        node_from_key = self.hash_table[self.get_hash_code(key)]
-        preview = self.hash_table[self.get_hash_code(key)]
-        if not node_from_key:
+        self.rehash_some()
+        if self.capacity == 0:
             return False
+        if not self.remove_from_chain(self.hash_table, self.get_hash_code(key), key):
+            if self.old_table is None or \
+                    not self.remove_from_chain(self.old_table, self.hash_code(key, self.old_capacity), key):
+                return False
+        self.table_size -= 1
 
-        if node_from_key.key == key:
-            self.table_size -= 1
-            self.hash_table[self.get_hash_code(key)] = node_from_key.next
-        else:
-            self.table_size -= 1
-            node_from_key = node_from_key.next
+        if self.min_load_factor is not None and self.old_table is None and self.capacity > self.min_capacity and \
+                self.table_size < self.min_load_factor * self.capacity:
+            self.start_rehash(max(self.capacity // 2, self.min_capacity))
+        return True
+
+    def insert_many(self, keys):
+        """Inserts a batch of keys, like insert for every key. The bucket indices are computed for the whole batch
+        at once and every chain is walked only once, but the keys are still linked in one by one, so this saves
+        the per-call overhead of insert, not the walk over the chains. The table grows like with insert, as the
+        number of stored keys crosses max_load_factor (the batch is processed in runs that fit below it).
+        :param keys:
+        		Iterable or NumPy array of keys.
+        :return:
+        		NumPy boolean mask, True where the key has been inserted, False where it was already stored
+        		(or occurred earlier in the batch).
+        :raises:
+        		a ValueError if any key is None.
+        """
+        keys = self.prepare_batch(keys)
+        inserted, added = np.zeros(len(keys), dtype=bool), []
+        position = 0
+        while position < len(keys):
+            stop = len(keys)
+            if self.max_load_factor is not None:
+                # a run of at most headroom keys cannot cross max_load_factor, the table grows between runs
+                headroom = int(self.max_load_factor * self.capacity) - self.table_size
+                if headroom < 1:
+                    self.start_rehash(max(2 * self.capacity, self.min_capacity))
+                    self.finish_rehash()
+                    continue
+                stop = min(position + headroom, stop)
+
+            table, count = self.hash_table, len(added)
+            for run_position, (key, index) in enumerate(zip(*self.bucket_indices(keys[position:stop])), position):
+                node_from_key, tail = table[index], None
+                while node_from_key is not None and node_from_key.key != key:
+                    node_from_key, tail = node_from_key.next, node_from_key
+                if node_from_key is None:
+                    if tail is None:
+                        table[index] = ChainingHashNode(key)
+                    else:
+                        tail.next = ChainingHashNode(key)
+                    added.append(run_position)
+            self.table_size += len(added) - count
+            position = stop
+
+        if added:
+            inserted[added] = True
+            self.bucket_snapshot = None
+        return inserted
+
+    def contains_many(self, keys):
+        """Searches for a batch of keys, like contains for every key. The bucket indices are computed for the whole
+        batch at once, the chains are still walked key by key. Batches of integer keys are looked up in one
+        vectorized pass instead if build_bucket_snapshot has been called since the set last changed.
+        :param keys:
+        		Iterable or NumPy array of keys.
+        :return:
+        		NumPy boolean mask, True where the key is stored.
+        :raises:
+        		a ValueError if any key is None.
+        """
+        keys = self.prepare_batch(keys)
+        if self.capacity == 0:
+            return np.zeros(len(keys), dtype=bool)
+        if self.bucket_snapshot is not None and isinstance(keys, np.ndarray):
+            return self.snapshot_contains(keys, self.bucket_snapshot)
+
+        found = np.zeros(len(keys), dtype=bool)
+        table = self.hash_table
+        for position, (key, index) in enumerate(zip(*self.bucket_indices(keys))):
+            node_from_key = table[index]
             while node_from_key:
                 if node_from_key.key == key:
-                    preview.next = node_from_key.next
+                    found[position] = True
                     break
-                else:
+                node_from_key = node_from_key.next
+        return found
+
+    def remove_many(self, keys):
+        """Removes a batch of keys, like remove for every key, with the bucket indices computed for the whole batch
+        at once. The table is shrunk once afterwards if it fell below min_load_factor.
+        :param keys:
+        		Iterable or NumPy array of keys.
+        :return:
+        		NumPy boolean mask, True where the key has been removed.
+        :raises:
+        		a ValueError if any key is None.
+        """
+        keys = self.prepare_batch(keys)
+        removed = np.zeros(len(keys), dtype=bool)
+        if self.capacity == 0:
+            return removed
+
+        table = self.hash_table
+        for position, (key, index) in enumerate(zip(*self.bucket_indices(keys))):
+            removed[position] = self.remove_from_chain(table, index, key)
+        self.table_size -= int(np.count_nonzero(removed))
+
+        if self.min_load_factor is not None and self.capacity > self.min_capacity and \
+                self.table_size < self.min_load_factor * self.capacity:
+            capacity = self.capacity
+            while capacity > self.min_capacity and self.table_size < self.min_load_factor * capacity:
+                capacity //= 2
+            self.start_rehash(max(capacity, self.min_capacity))
+            self.finish_rehash()
+        return removed
+
+    def prepare_batch(self, keys):
+        """Validates the keys of a batch operation and completes an ongoing resize.
+        :return:
+        		The keys as int64 NumPy array if they are all 64-bit integers, as list otherwise.
+        """
+        if isinstance(keys, np.ndarray):
+            if keys.dtype.kind == 'i' or keys.dtype.kind == 'u' and (not len(keys) or keys.max() < 1 << 63):
+                keys = keys.astype(np.int64, copy=False)
+            else:
+                keys = keys.tolist()
+        else:
+            keys = list(keys)
+            if all(type(key) is int and -(1 << 63) <= key < 1 << 63 for key in keys):
+                keys = np.array(keys, dtype=np.int64)
+        if isinstance(keys, list) and any(key is None for key in keys):
+            raise ValueError
+        self.finish_rehash()
+        return keys
+
+    def bucket_indices(self, keys):
+        """Computes the bucket index of every key; integer arrays hashed by the modulo division in one
+        vectorized NumPy operation.
+        :return:
+        		The keys and their bucket indices, both as lists.
+        """
+        if len(keys) and self.capacity == 0:
+            raise ZeroDivisionError('hash table without buckets')
+        if isinstance(keys, np.ndarray) and self.hash_strategy is modulo_hash:
+            return keys.tolist(), (keys % self.capacity).tolist()
+        keys = keys.tolist() if isinstance(keys, np.ndarray) else keys
+        return keys, [self.hash_code(key, self.capacity) for key in keys]
+
+    def build_bucket_snapshot(self):
+        """Flattens the table into NumPy arrays, (bucket_start, bucket_keys): the keys of bucket i are
+        bucket_keys[bucket_start[i]:bucket_start[i + 1]]. Building it walks the whole table once, which costs
+        more than a contains for every stored key, so it only pays off for repeated contains_many calls
+        on a set that no longer changes. Every change of the set discards the snapshot.
+        :return:
+        		The snapshot, or None if the stored keys are not all 64-bit integers hashed by the modulo division.
+        """
+        self.finish_rehash()
+        if self.hash_strategy is not modulo_hash or self.capacity == 0:
+            return None
+        if self.bucket_snapshot is None:
+            lengths, stored = np.zeros(self.capacity, dtype=np.int64), []
+            for index, node_from_key in enumerate(self.hash_table):
+                while node_from_key:
+                    stored.append(node_from_key.key)
+                    lengths[index] += 1
                     node_from_key = node_from_key.next
-                    preview = preview.next
-        return True
+            try:
+                bucket_keys = np.array(stored, dtype=np.int64)
+            except (OverflowError, TypeError, ValueError):
+                return None
+            bucket_start = np.zeros(self.capacity + 1, dtype=np.int64)
+            np.cumsum(lengths, out=bucket_start[1:])
+            self.bucket_snapshot = bucket_start, bucket_keys
+        return self.bucket_snapshot
+
+    def snapshot_contains(self, keys, snapshot):
+        bucket_start, bucket_keys = snapshot
+        index = keys % self.capacity
+        start = bucket_start[index]
+        counts = bucket_start[index + 1] - start
+
+        # compare every key only with the keys of its own bucket
+        owner = np.repeat(np.arange(len(keys)), counts)
+        position = np.repeat(start - np.cumsum(counts) + counts, counts) + np.arange(len(owner))
+        hit = bucket_keys[position] == keys[owner]
+        return np.bincount(owner[hit], minlength=len(keys)) > 0
+
+    def remove_from_chain(self, table, index, key):
+        node_from_key = table[index]
+        preview = None
+        while node_from_key:
+            if node_from_key.key == key:
+                if preview is None:
+                    table[index] = node_from_key.next
+                else:
+                    preview.next = node_from_key.next
+                self.bucket_snapshot = None
+                return True
+            preview = node_from_key
+            node_from_key = node_from_key.next
+        return False
+
+    def start_rehash(self, capacity):
+        """Switches to a new, empty table with the given capacity. The keys of the current table are moved over
+        by rehash_some, rehash_step buckets per operation, or all at once if there is no rehash step.
+        """
+        self.old_table, self.old_capacity, self.rehash_index = self.hash_table, self.capacity, 0
+        self.bucket_snapshot = None
+        self.hash_table = [None] * capacity
+        self.capacity = capacity
+        if self.rehash_step is None:
+            self.finish_rehash()
+        else:
+            # move enough buckets per operation to be done before inserts can trigger the next resize
+            headroom = max(int(self.max_load_factor * capacity) - self.table_size, 1)
+            self.buckets_per_step = max(self.rehash_step, -(-self.old_capacity // headroom))
+
+    def rehash_some(self, buckets=None):
+        """Moves the next buckets of an ongoing resize to the new table.
+        :param buckets:
+        		Number of buckets to move, None for the step of the current resize (at least rehash_step).
+        """
+        if self.old_table is None:
+            return
+        stop = min(self.rehash_index + (self.buckets_per_step if buckets is None else buckets), self.old_capacity)
+        for index in range(self.rehash_index, stop):
+            node_from_key = self.old_table[index]
+            self.old_table[index] = None
+            while node_from_key:
+                following = node_from_key.next
+                new_hash = self.get_hash_code(node_from_key.key)
+                node_from_key.next = self.hash_table[new_hash]
+                self.hash_table[new_hash] = node_from_key
+                node_from_key = following
+        self.rehash_index = stop
+        if stop == self.old_capacity:
+            self.old_table = None
+
+    def finish_rehash(self):
+        """Completes an ongoing resize at once."""
+        if self.old_table is not None:
+            self.rehash_some(self.old_capacity)
 
     def clear(self):
         """Removes all stored elements from the hash table by setting all nodes to None.
         """
+        self.old_table = None
+        self.bucket_snapshot = None
         table_size_clear = 0
         self.table_size = 0
         while table_size_clear < len(self.hash_table):
@@ -134,13 +469,18 @@ class ChainingHashSet():
     def to_string(self):
         """Returns a string representation of the hash table (array indices and stored keys) in the format
             Idx_0 {Node, Node, ... }, Idx_1 {...}
-            e.g.: 0 {13}, 1 {82, 92, 12}, 2 {2, 32}, """
-        some_hash_string = ''
-        for hash_value in range(self.capacity):
-            some_hash_string += '{hash}'.format(hash=hash_value) + ' {'
-            node_from_key = self.hash_table[hash_value]
-            while node_from_key is not None:
-                some_hash_string += f'{node_from_key.key}, '
-                node_from_key = node_from_key.next
-            some_hash_string += '}, ' if some_hash_string[-1] == '{' else some_hash_string[:-2] + '}, '
-        return some_hash_string[:-2]
+            e.g.: 0 {13}, 1 {82, 92, 12}, 2 {2, 32}"""
+        stream = StringIO()
+        self.write_to(stream)
+        return stream.getvalue()
+
+    def write_to(self, stream):
+        """Writes the representation of to_string bucket by bucket to a file-like object, in time linear in
+        the number of buckets and keys and without building the whole string in memory.
+        :param stream:
+        		Object with a write(str) method, e.g. an open text file.
+        """
+        separator = ''
+        for index, keys in self.iter_buckets():
+            stream.write(f'{separator}{index} {{{", ".join(map(str, keys))}}}')
+            separator = ', '
@@ -0,0 +1,157 @@
+import gc
+import sys
+import tracemalloc
+from random import sample, seed
+from threading import Lock, Thread
+from time import perf_counter
+
+import numpy as np
+
+from chaining_hash_set import ChainingHashSet
+from hash_strategies import SeededHash, fibonacci_hash, mixed_hash, modulo_hash
+from linear_probing_hash_set import LinearProbingHashSet
+from sharded_hash_set import ShardedChainingHashSet
+
+
+def timed(function, *args):
+    start = perf_counter()
+    result = function(*args)
+    return result, perf_counter() - start
+
+
+def insert_all(hash_set, keys):
+    for key in keys:
+        hash_set.insert(key)
+
+
+def contains_all(hash_set, keys):
+    for key in keys:
+        hash_set.contains(key)
+
+
+def remove_all(hash_set, keys):
+    for key in keys:
+        hash_set.remove(key)
+
+
+def footprint(hash_set, keys):
+    """Inserts the keys and reports the memory allocated meanwhile, in bytes per key."""
+    tracemalloc.start()
+    insert_all(hash_set, keys)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return allocated / len(keys)
+
+
+class GlobalLockHashSet():
+    """The baseline for the sharded set: one ChainingHashSet behind a single lock."""
+
+    def __init__(self):
+        self.hash_set = ChainingHashSet(max_load_factor=1.0)
+        self.lock = Lock()
+
+    def insert(self, key):
+        with self.lock:
+            return self.hash_set.insert(key)
+
+    def contains(self, key):
+        with self.lock:
+            return self.hash_set.contains(key)
+
+
+def threaded(hash_set, keys, threads):
+    """Inserts and then looks up the keys from the given number of threads, each one taking every threads-th key.
+    :return elapsed seconds of the inserting and of the looking up phase.
+    """
+    elapsed = []
+    for phase in (insert_all, contains_all):
+        workers = [Thread(target=phase, args=(hash_set, keys[i::threads])) for i in range(threads)]
+        start = perf_counter()
+        for worker in workers: worker.start()
+        for worker in workers: worker.join()
+        elapsed.append(perf_counter() - start)
+    return elapsed
+
+
+def slowest_insert(hash_set, keys):
+    slowest = 0.0
+    for key in keys:
+        start = perf_counter()
+        hash_set.insert(key)
+        slowest = max(slowest, perf_counter() - start)
+    return slowest
+
+
+def main(size):
+    seed(0)
+    keys = sample(range(100 * size), size)
+    missing = [key + 100 * size for key in keys]
+
+    for count in (size // 100, size // 10, size):
+        hash_set = ChainingHashSet(count)
+        _, inserting = timed(insert_all, hash_set, keys[:count])
+        _, hits = timed(contains_all, hash_set, keys[:count])
+        _, misses = timed(contains_all, hash_set, missing[:count])
+        print(f'{count:>10,} keys: {1e9 * inserting / count:8.0f} ns/insert  {1e9 * hits / count:8.0f} ns/hit'
+              f'  {1e9 * misses / count:8.0f} ns/miss')
+
+    for hash_set in (ChainingHashSet(max_load_factor=1.0), LinearProbingHashSet()):
+        per_key = footprint(hash_set, keys)
+        _, hits = timed(contains_all, hash_set, keys)
+        _, misses = timed(contains_all, hash_set, missing)
+        print(f'{type(hash_set).__name__:22} {per_key:6.1f} bytes/key  {1e9 * hits / size:8.0f} ns/hit'
+              f'  {1e9 * misses / size:8.0f} ns/miss')
+
+    key_array, missing_array = np.array(keys), np.array(missing)
+    hash_set = ChainingHashSet()
+    _, inserting = timed(insert_all, hash_set, keys)
+    _, hits = timed(contains_all, hash_set, keys)
+    _, misses = timed(contains_all, hash_set, missing)
+    _, removing = timed(remove_all, hash_set, keys)
+    print(f'per-key calls: {1e9 * inserting / size:7.0f} ns/insert  {1e9 * hits / size:8.0f} ns/hit'
+          f'  {1e9 * misses / size:8.0f} ns/miss  {1e9 * removing / size:8.0f} ns/remove')
+    hash_set = ChainingHashSet()
+    _, inserting = timed(hash_set.insert_many, key_array)
+    _, hits = timed(hash_set.contains_many, key_array)
+    _, misses = timed(hash_set.contains_many, missing_array)
+    _, removing = timed(hash_set.remove_many, key_array)
+    print(f'batch APIs:    {1e9 * inserting / size:7.0f} ns/insert  {1e9 * hits / size:8.0f} ns/hit'
+          f'  {1e9 * misses / size:8.0f} ns/miss  {1e9 * removing / size:8.0f} ns/remove')
+
+    hash_set.insert_many(key_array)
+    _, building = timed(hash_set.build_bucket_snapshot)
+    _, hits = timed(hash_set.contains_many, key_array)
+    _, misses = timed(hash_set.contains_many, missing_array)
+    print(f'with snapshot: {1e3 * building:7.0f} ms to build  {1e9 * hits / size:8.0f} ns/hit'
+          f'  {1e9 * misses / size:8.0f} ns/miss')
+
+    # adversarial keys for the modulo division: multiples of the capacity
+    capacity = 1 << 12
+    strided = range(0, capacity * capacity, capacity)
+    for strategy in (modulo_hash, mixed_hash, fibonacci_hash, SeededHash(0)):
+        hash_set = ChainingHashSet(capacity, hash_strategy=strategy)
+        insert_all(hash_set, strided)
+        histogram = hash_set.chain_length_histogram()
+        print(f'{getattr(strategy, "__name__", type(strategy).__name__):15} strided keys: longest chain'
+              f' {max(histogram):5}, empty buckets {histogram.get(0, 0) / capacity:6.1%}')
+
+    for rehash_step in (None, 4):
+        hash_set = ChainingHashSet(max_load_factor=1.0, rehash_step=rehash_step)
+        slowest, elapsed = timed(slowest_insert, hash_set, keys)
+        print(f'growing from 0, rehash_step={rehash_step}: {1e9 * elapsed / size:8.0f} ns/insert'
+              f'  slowest insert {1e3 * slowest:8.2f} ms  (capacity {hash_set.capacity:,})')
+
+    hash_set = None
+    for threads in (1, 2, 4, 8):
+        for make in (GlobalLockHashSet, lambda: ShardedChainingHashSet(shards=4 * threads)):
+            # drop the previous set first, a larger heap would slow the garbage collector down for the next one
+            hash_set = None
+            gc.collect()
+            hash_set = make()
+            inserting, looking_up = threaded(hash_set, keys, threads)
+            print(f'{threads} threads, {type(hash_set).__name__:22} {size / inserting / 1e6:6.2f} M inserts/s'
+                  f'  {size / looking_up / 1e6:6.2f} M lookups/s')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6)
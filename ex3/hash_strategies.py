@@ -0,0 +1,44 @@
+"""Hash strategies for ChainingHashSet. A strategy maps a key and the current capacity to a bucket index."""
+
+MASK_64 = (1 << 64) - 1
+GOLDEN_RATIO_64 = 0x9E3779B97F4A7C15
+
+
+def mix_64(value):
+    """Finalizer of SplitMix64: scrambles the bits of a 64-bit value so that similar inputs
+    (e.g. keys with a common stride) end up far apart.
+    """
+    value = (value ^ (value >> 30)) * 0xBF58476D1CE4E5B9 & MASK_64
+    value = (value ^ (value >> 27)) * 0x94D049BB133111EB & MASK_64
+    return value ^ (value >> 31)
+
+
+def modulo_hash(key, capacity):
+    """Modulo division of an integer key. Cheap, but keys with a stride sharing a factor with the
+    capacity only reach a fraction of the buckets.
+    """
+    return key % capacity
+
+
+def mixed_hash(key, capacity):
+    """Python's hash() of any hashable key, scrambled with the SplitMix64 finalizer."""
+    return mix_64(hash(key) & MASK_64) % capacity
+
+
+def fibonacci_hash(key, capacity):
+    """Multiplicative (Fibonacci) hashing: multiplies hash(key) by 2^64 / golden ratio and maps the
+    high-order bits of the product onto the capacity.
+    """
+    return ((hash(key) * GOLDEN_RATIO_64 & MASK_64) * capacity) >> 64
+
+
+class SeededHash:
+    """Python's hash() of any key mixed with a secret seed, so the bucket of a key cannot be predicted
+    without knowing the seed.
+    """
+
+    def __init__(self, seed):
+        self.seed = mix_64(seed & MASK_64)
+
+    def __call__(self, key, capacity):
+        return mix_64((hash(key) ^ self.seed) & MASK_64) % capacity
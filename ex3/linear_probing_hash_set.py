@@ -0,0 +1,139 @@
+from array import array
+
+from hash_strategies import GOLDEN_RATIO_64, MASK_64
+
+MIN_CAPACITY = 8
+
+
+class LinearProbingHashSet():
+    """Hash set of 64-bit integer keys with open addressing. The keys are stored in one flat array next to
+    a byte array of occupied flags, so there is no node object per key. Collisions are resolved by linear
+    probing and removals shift the following keys back (no tombstones), so probe sequences stay short.
+    """
+
+    def __init__(self, capacity=MIN_CAPACITY, max_load_factor=0.75):
+        """
+        :param capacity:
+        		Initial number of slots, rounded up to a power of two.
+        :param max_load_factor:
+        		The table doubles once more than this fraction of the slots would be occupied.
+        :raises:
+        		a ValueError if max_load_factor is not in (0, 1).
+        """
+        if not 0 < max_load_factor < 1:
+            raise ValueError
+        self.max_load_factor = max_load_factor
+        self.table_size = 0
+        self.allocate(max(capacity, MIN_CAPACITY))
+
+    def allocate(self, capacity):
+        bits = (capacity - 1).bit_length()
+        self.capacity = 1 << bits
+        self.mask = self.capacity - 1
+        self.shift = 64 - bits
+        self.keys = array('q', bytes(8 * self.capacity))
+        self.used = bytearray(self.capacity)
+
+    def get_hash_code(self, key):
+        """Fibonacci hashing: the high-order bits of key * 2^64 / golden ratio select the home slot.
+        :param key:
+        		Key for which the home slot shall be calculated.
+        :return:
+        		The home slot of the key.
+        """
+        return ((key & MASK_64) * GOLDEN_RATIO_64 & MASK_64) >> self.shift
+
+    def get_table_size(self):
+        """returns the number of stored keys (keys must be unique!)."""
+        return self.table_size
+
+    def insert(self, key):
+        """Inserts a key and returns True if it was successful. If there is already an entry with the
+          same key, the new key will not be inserted and False is returned.
+         :param key:
+         		The 64-bit integer key which shall be stored in the hash table.
+         :return:
+         		True if key could be inserted, or False if the key is already in the hash table.
+         :raises:
+         		a ValueError if the key is None.
+         """
+        if key is None:
+            raise ValueError
+        if self.table_size + 1 > self.max_load_factor * self.capacity:
+            self.allocate_and_rehash(2 * self.capacity)
+
+        keys, used, mask = self.keys, self.used, self.mask
+        slot = self.get_hash_code(key)
+        while used[slot]:
+            if keys[slot] == key:
+                return False
+            slot = (slot + 1) & mask
+        keys[slot] = key
+        used[slot] = 1
+        self.table_size += 1
+        return True
+
+    def contains(self, key):
+        """Searches for a given key in the hash table.
+         :param key:
+         	    The key to be searched in the hash table.
+         :return:
+         	    True if the key is already stored, otherwise False.
+         :raises:
+         	    a ValueError if the key is None.
+         """
+        if key is None:
+            raise ValueError
+        return self.find_slot(key) is not None
+
+    def remove(self, key):
+        """Removes the key from the hash table and returns True on success, False otherwise.
+        :param key:
+        		The key to be removed from the hash table.
+        :return:
+        		True if the key was found and removed, False otherwise.
+        :raises:
+         	a ValueError if the key is None.
+        """
+        if key is None:
+            raise ValueError
+        hole = self.find_slot(key)
+        if hole is None:
+            return False
+
+        # backward shift: move every following key of the cluster that may live in the hole into it
+        keys, used, mask = self.keys, self.used, self.mask
+        slot = hole
+        while True:
+            slot = (slot + 1) & mask
+            if not used[slot]:
+                break
+            home = self.get_hash_code(keys[slot])
+            if (slot - home) & mask >= (slot - hole) & mask:
+                keys[hole] = keys[slot]
+                hole = slot
+        used[hole] = 0
+        self.table_size -= 1
+        return True
+
+    def clear(self):
+        """Removes all stored elements from the hash table."""
+        self.used = bytearray(self.capacity)
+        self.table_size = 0
+
+    def find_slot(self, key):
+        keys, used, mask = self.keys, self.used, self.mask
+        slot = self.get_hash_code(key)
+        while used[slot]:
+            if keys[slot] == key:
+                return slot
+            slot = (slot + 1) & mask
+        return None
+
+    def allocate_and_rehash(self, capacity):
+        keys, used = self.keys, self.used
+        self.allocate(capacity)
+        self.table_size = 0
+        for slot in range(len(used)):
+            if used[slot]:
+                self.insert(keys[slot])
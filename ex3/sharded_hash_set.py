@@ -0,0 +1,79 @@
+from threading import Lock
+
+from chaining_hash_set import ChainingHashSet
+
+
+class ShardedChainingHashSet():
+    """Thread-safe hash set made of several ChainingHashSet shards, each guarding its own group of buckets
+    with its own lock (lock striping). Threads working on keys of different shards do not wait for each other.
+    On CPython builds with the GIL only one thread runs Python code at a time, so the shards cannot work in
+    parallel and the extra shard selection makes this a bit slower than one ChainingHashSet behind one lock;
+    throughput only scales with the number of threads on free-threaded builds.
+    """
+
+    def __init__(self, capacity=0, shards=15, **options):
+        """
+        :param capacity:
+        		Initial number of buckets over all shards.
+        :param shards:
+        		Number of shards, i.e. of independent locks. Rounded up to an odd number.
+        :param options:
+        		Further ChainingHashSet arguments (load factors, rehash step, hash strategy) used by every shard.
+        :raises:
+        		a ValueError if shards is not positive.
+        """
+        if shards <= 0:
+            raise ValueError
+        # an odd shard count shares no factor with the power-of-two capacities of the shards, so the keys of a
+        # shard (all equal modulo the shard count) still spread over all of its buckets
+        shards |= 1
+        capacity = 1 << (-(-capacity // shards) - 1).bit_length() if capacity > 0 else 0
+        self.shards = [ChainingHashSet(capacity, **options) for _ in range(shards)]
+        self.locks = [Lock() for _ in range(shards)]
+
+    def get_shard_index(self, key):
+        """The shard of a key is its hash modulo the (odd) number of shards."""
+        return hash(key) % len(self.shards)
+
+    def get_table_size(self):
+        """returns the number of stored keys, summed over the shards."""
+        return sum(shard.get_table_size() for shard in self.shards)
+
+    def insert(self, key):
+        """Inserts a key and returns True if it was successful, False if the key is already stored.
+        :raises:
+        		a ValueError if the key is None.
+        """
+        if key is None:
+            raise ValueError
+        index = self.get_shard_index(key)
+        with self.locks[index]:
+            return self.shards[index].insert(key)
+
+    def contains(self, key):
+        """Returns True if the key is stored, otherwise False.
+        :raises:
+        		a ValueError if the key is None.
+        """
+        if key is None:
+            raise ValueError
+        index = self.get_shard_index(key)
+        with self.locks[index]:
+            return self.shards[index].contains(key)
+
+    def remove(self, key):
+        """Removes the key and returns True on success, False if it was not stored.
+        :raises:
+        		a ValueError if the key is None.
+        """
+        if key is None:
+            raise ValueError
+        index = self.get_shard_index(key)
+        with self.locks[index]:
+            return self.shards[index].remove(key)
+
+    def clear(self):
+        """Removes all stored keys. The shards are cleared one after another."""
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                shard.clear()
@@ -6,6 +6,9 @@ class Graph:
     def __init__(self):
         self.vertices = []  # list of vertices in the graph
         self.edges = []  # list of edges in the graph
+        self.vertices_by_name = {}  # vertex name -> vertex
+        self.edges_by_vertices = {}  # (vertex, vertex) -> edge, stored in both orders
+        self.adjacency = []  # per vertex index: list of (neighbour, weight) tuples
         self.num_vertices = 0
         self.num_edges = 0
         self.undirected_graph = True
@@ -54,6 +57,8 @@ class Graph:
 
         self.num_vertices += 1
         self.vertices.append(node)
+        self.vertices_by_name[vertex_name] = node
+        self.adjacency.append([])
 
         return node
 
@@ -67,11 +72,7 @@ class Graph:
         if vertex_name is None:
             raise ValueError
 
-        for i in self.vertices:
-            if i.name == vertex_name:
-                return i
-
-        return None
+        return self.vertices_by_name.get(vertex_name)
 
     def insert_edge_by_vertex_names(self, v1_name, v2_name, weight: int):
         """
@@ -107,6 +108,8 @@ class Graph:
         self.num_edges += 1
 
         self.edges.append(nwe)
+        self.edges_by_vertices[v1, v2] = self.edges_by_vertices[v2, v1] = nwe
+        self.add_neighbours(v1, v2, weight)
 
         return nwe
 
@@ -125,8 +128,13 @@ class Graph:
         if v1 == v2 or v1 is None or v2 is None:
             raise ValueError
 
-        if self.find_vertex(v1.name) is None or self.find_vertex(v2.name) is None or \
-                self.find_edge(v1, v2) is not None:
+        # vertices are matched by name, the edge and the indexes always refer to the graph's own vertex objects
+        v1, v2 = self.find_vertex(v1.name), self.find_vertex(v2.name)
+        if v1 is None or v2 is None:
+            return None
+        if v1 is v2:
+            raise ValueError
+        if self.find_edge(v1, v2) is not None:
             return None
 
         new_edge = Edge(v1, v2, weight)
@@ -134,6 +142,8 @@ class Graph:
         self.num_edges += 1
 
         self.edges.append(new_edge)
+        self.edges_by_vertices[v1, v2] = self.edges_by_vertices[v2, v1] = new_edge
+        self.add_neighbours(v1, v2, weight)
 
         return new_edge
 
@@ -150,10 +160,6 @@ class Graph:
         v1 = self.find_vertex(v1_name)
         v2 = self.find_vertex(v2_name)
 
-        for e in self.edges:
-            if e.first_vertex in [v1, v2] and e.second_vertex in [v1, v2]:
-                return e
-
         if v1 is None:
             return None
         if v2 is None:
@@ -161,10 +167,8 @@ class Graph:
 
         if v1_name == v2_name:
             raise ValueError
-        if v1_name is None:
-            raise ValueError
-        if v2_name is None:
-            raise ValueError
+
+        return self.edges_by_vertices.get((v1, v2))
 
     def find_edge(self, v1: Vertex, v2: Vertex):
         """
@@ -182,14 +186,13 @@ class Graph:
         if v2 is None:
             raise ValueError
 
-        if self.find_vertex(v1.name) is None:
+        v1, v2 = self.find_vertex(v1.name), self.find_vertex(v2.name)
+        if v1 is None:
             return None
-        if self.find_vertex(v2.name) is None:
+        if v2 is None:
             return None
 
-        for e in self.edges:
-            if e.first_vertex in [v1, v2] and e.second_vertex in [v1, v2]:
-                return e
+        return self.edges_by_vertices.get((v1, v2))
 
     def get_adjacency_matrix(self):
         """
@@ -202,12 +205,31 @@ class Graph:
         m = [[-1 for j in range(N)] for i in range(N)]
 
         for v in self.get_vertices():
-            for a in self.get_adjacent_vertices(v):
-                edge: Edge = self.find_edge(v, a)
-                m[v.idx][a.idx] = int(edge.weight)
+            for neighbour, weight in self.adjacency[v.idx]:
+                m[v.idx][neighbour.idx] = int(weight)
 
         return m
 
+    def add_neighbours(self, v1: Vertex, v2: Vertex, weight):
+        self.adjacency[v1.idx].append((v2, weight))
+        self.adjacency[v2.idx].append((v1, weight))
+
+    def get_adjacency_list(self, vertex: Vertex):
+        """
+        Returns the neighbours of the given vertex together with the weights of the connecting edges, in O(1).
+        The returned list is owned by the graph and must not be modified.
+        :param vertex: The vertex whose neighbours are searched.
+        :return: list of (neighbour vertex, edge weight) tuples, empty if the vertex is not part of the graph.
+        :raises: ValueError if vertex is None
+        """
+        if vertex is None:
+            raise ValueError
+
+        if self.find_vertex(vertex.name) is not vertex:
+            return []
+
+        return self.adjacency[vertex.idx]
+
     def get_adjacent_vertices_by_vertex_name(self, vertex_name):
         """
         Returns a list of vertices which are adjacent to the vertex with name vertex_name.
@@ -215,19 +237,12 @@ class Graph:
         :return: list of vertices that are adjacent to the vertex with name vertex_name.
         :raises: ValueError if vertex_name is None
         """
-        if vertex_name is None:
-            raise ValueError
-
-        list = []
-
-        for e in self.edges:
-            if e.first_vertex.name == vertex_name:
-                list.append(e.second_vertex)
+        vertex = self.find_vertex(vertex_name)
 
-            if e.second_vertex.name == vertex_name:
-                list.append(e.first_vertex)
+        if vertex is None:
+            return []
 
-        return list
+        return [neighbour for neighbour, _ in self.adjacency[vertex.idx]]
 
     def get_adjacent_vertices(self, vertex: Vertex):
         """
@@ -236,16 +251,4 @@ class Graph:
         :return: list of vertices that are adjacent to the vertex.
         :raises: ValueError if vertex is None
         """
-        if vertex is None:
-            raise ValueError
-
-        list = []
-
-        for e in self.edges:
-            if e.first_vertex == vertex:
-                list.append(e.second_vertex)
-
-            if e.second_vertex == vertex:
-                list.append(e.first_vertex)
-
-        return list
+        return [neighbour for neighbour, _ in self.get_adjacency_list(vertex)]
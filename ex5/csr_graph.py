@@ -0,0 +1,180 @@
+from heapq import heappop, heappush
+
+import numpy as np
+
+
+class CSRGraph:
+    """Read-only, undirected graph in compressed sparse row layout. The neighbours of the vertex with index i
+    are indices[indptr[i]:indptr[i + 1]], reached over edges with the weights at the same positions; every
+    edge is stored once in each direction. Vertex indices are the Vertex.idx of the graph it was frozen from.
+    """
+
+    def __init__(self, indptr, indices, weights, names):
+        """
+        :param indptr: Array of length N + 1 with the start of every vertex's neighbours in indices.
+        :param indices: Array with the neighbour indices of all vertices, one vertex after another.
+        :param weights: Array with the weight of the edge to each entry of indices.
+        :param names: List of the N vertex names, by index.
+        :raises: ValueError if the arrays do not fit together.
+        """
+        if len(indptr) != len(names) + 1 or len(indices) != len(weights) or indptr[-1] != len(indices):
+            raise ValueError
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.weights = np.asarray(weights)
+        self.names = list(names)
+        self.index_by_name = {name: i for i, name in enumerate(self.names)}
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Freezes a Graph. Later changes of the graph are not reflected in the returned CSRGraph.
+        :param graph: The graph to freeze.
+        :return: the CSRGraph with the same vertices (by index) and edges.
+        """
+        edges = graph.get_edges()
+        first = np.fromiter((e.first_vertex.idx for e in edges), dtype=np.int64, count=len(edges))
+        second = np.fromiter((e.second_vertex.idx for e in edges), dtype=np.int64, count=len(edges))
+        weight = np.array([e.weight for e in edges])
+
+        sources = np.concatenate((first, second))
+        order = np.argsort(sources, kind='stable')
+        indptr = np.zeros(graph.get_number_of_vertices() + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=graph.get_number_of_vertices()), out=indptr[1:])
+        return cls(indptr, np.concatenate((second, first))[order], np.concatenate((weight, weight))[order],
+                   [v.name for v in graph.get_vertices()])
+
+    def get_number_of_vertices(self):
+        """
+        :return: the number of vertices in the graph
+        """
+        return len(self.names)
+
+    def get_number_of_edges(self):
+        """
+        :return: the number of (undirected) edges in the graph
+        """
+        return len(self.indices) // 2
+
+    def find_vertex_index(self, vertex_name):
+        """
+        :param vertex_name: the name of the vertex to find
+        :return: the index of the vertex, or None if no matching vertex has been found.
+        :raises: ValueError if vertex_name is None.
+        """
+        if vertex_name is None:
+            raise ValueError
+        return self.index_by_name.get(vertex_name)
+
+    def get_neighbours(self, index):
+        """
+        :param index: index of the vertex whose neighbours are searched
+        :return: tuple of the neighbour indices and the weights of the connecting edges, as array views.
+        """
+        start, stop = self.indptr[index], self.indptr[index + 1]
+        return self.indices[start:stop], self.weights[start:stop]
+
+    def get_degrees(self):
+        """
+        :return: array with the number of neighbours of every vertex, by index.
+        """
+        return np.diff(self.indptr)
+
+    def get_shortest_distances_from(self, source):
+        """
+        Dijkstra's algorithm with a binary heap. The neighbours of each settled vertex are relaxed at once.
+        :param source: index of the start vertex
+        :return: tuple of two arrays, by vertex index: the shortest distance (-1 if there is no path) and the
+                 predecessor on the shortest path (-1 for the source and unreachable vertices).
+        :raises: ValueError if source is not a vertex index.
+        """
+        if not 0 <= source < self.get_number_of_vertices():
+            raise ValueError
+
+        distances = np.full(self.get_number_of_vertices(), np.inf)
+        predecessors = np.full(self.get_number_of_vertices(), -1, dtype=np.int64)
+        settled = np.zeros(self.get_number_of_vertices(), dtype=bool)
+        distances[source] = 0
+        heap = [(0, source)]
+        while heap:
+            distance, vertex = heappop(heap)
+            if settled[vertex]:
+                continue
+            settled[vertex] = True
+            neighbours, weights = self.get_neighbours(vertex)
+            candidates = distance + weights
+            improved = candidates < distances[neighbours]
+            neighbours, candidates = neighbours[improved], candidates[improved]
+            distances[neighbours] = candidates
+            predecessors[neighbours] = vertex
+            for entry in zip(candidates.tolist(), neighbours.tolist()):
+                heappush(heap, entry)
+
+        distances[~settled] = -1
+        return distances.astype(self.weights.dtype), predecessors
+
+    def get_shortest_path_from_to(self, source, target):
+        """
+        :param source: index of the start vertex
+        :param target: index of the destination vertex
+        :return: list of (vertex index, covered distance) tuples along the shortest path, or None if there is no
+                 path between the two vertices.
+        :raises: ValueError if source or target is not a vertex index, or if source equals target.
+        """
+        if source == target or not 0 <= target < self.get_number_of_vertices():
+            raise ValueError
+
+        distances, predecessors = self.get_shortest_distances_from(source)
+        if distances[target] < 0:
+            return None
+        path = [target]
+        while path[-1] != source:
+            path.append(int(predecessors[path[-1]]))
+        return [(vertex, distances[vertex].item()) for vertex in reversed(path)]
+
+    def get_steps_for_shortest_paths_from(self, source):
+        """
+        Counts the edges on the (weighted) shortest path to every vertex, as JKUMap.get_steps_for_shortest_paths_from.
+        The predecessor chains of get_shortest_distances_from are followed by pointer jumping: every round adds
+        the count of the current ancestor and jumps to its ancestor, so O(log V) array operations suffice.
+        :param source: index of the start vertex
+        :return: array with the number of edges on the shortest path to every vertex (-1 if there is no path).
+        :raises: ValueError if source is not a vertex index.
+        """
+        distances, predecessors = self.get_shortest_distances_from(source)
+        steps = (predecessors >= 0).astype(np.int64)
+        ancestors = predecessors.copy()
+        jumping = ancestors >= 0
+        while jumping.any():
+            targets = ancestors[jumping]
+            steps[jumping] += steps[targets]
+            ancestors[jumping] = ancestors[targets]
+            jumping = ancestors >= 0
+        steps[distances < 0] = -1
+        return steps
+
+    def get_hop_counts_from(self, source):
+        """
+        Level-synchronous breadth-first search: the whole frontier is expanded with array operations. The weights
+        are ignored, so this is the least number of edges to every vertex, which can be smaller than the number
+        of edges on the shortest weighted path (see get_steps_for_shortest_paths_from).
+        :param source: index of the start vertex
+        :return: array with the least number of edges to every vertex (-1 if there is no path).
+        :raises: ValueError if source is not a vertex index.
+        """
+        if not 0 <= source < self.get_number_of_vertices():
+            raise ValueError
+
+        steps = np.full(self.get_number_of_vertices(), -1, dtype=np.int64)
+        steps[source] = 0
+        degrees, frontier, level = self.get_degrees(), np.array([source]), 0
+        while frontier.size:
+            level += 1
+            starts, lengths = self.indptr[frontier], degrees[frontier]
+            # positions of all frontier neighbours in indices: each start repeated over its run, plus 0, 1, ...
+            ends = np.cumsum(lengths)
+            positions = np.repeat(starts - ends + lengths, lengths) + np.arange(ends[-1] if ends.size else 0)
+            neighbours = self.indices[positions]
+            frontier = np.unique(neighbours[steps[neighbours] < 0])
+            steps[frontier] = level
+        return steps
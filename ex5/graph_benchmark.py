@@ -0,0 +1,95 @@
+import sys
+import tracemalloc
+from collections import deque
+from random import randrange, seed
+from time import perf_counter
+
+from csr_graph import CSRGraph
+from graph import Graph
+
+SCAN_LIMIT = 2000  # the edge-list scan costs O(V*E), so it is only timed on small graphs
+
+
+def timed(function, *args):
+    start = perf_counter()
+    result = function(*args)
+    return result, perf_counter() - start
+
+
+def random_graph(num_vertices, num_edges):
+    graph = Graph()
+    vertices = [graph.insert_vertex(str(i)) for i in range(num_vertices)]
+    while graph.get_number_of_edges() < num_edges:
+        v1, v2 = randrange(num_vertices), randrange(num_vertices)
+        if v1 != v2:
+            graph.insert_edge(vertices[v1], vertices[v2], randrange(1, 100))
+    return graph
+
+
+def footprint(num_vertices, num_edges):
+    """Builds a random graph and reports the memory allocated for it, in bytes per edge."""
+    tracemalloc.start()
+    graph = random_graph(num_vertices, num_edges)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return graph, allocated / num_edges
+
+
+def scan_adjacent_vertices(graph, vertex_name):
+    """The neighbours found by scanning the whole edge list, as get_adjacent_vertices used to."""
+    names = []
+    for e in graph.get_edges():
+        if e.first_vertex.name == vertex_name:
+            names.append(e.second_vertex.name)
+        if e.second_vertex.name == vertex_name:
+            names.append(e.first_vertex.name)
+    return names
+
+
+def breadth_first(graph, adjacent_vertices):
+    """Visits every vertex once, breadth first from each not yet visited one, and returns the number of components."""
+    visited, components = set(), 0
+    for vertex in graph.get_vertices():
+        if vertex.name in visited:
+            continue
+        components += 1
+        visited.add(vertex.name)
+        queue = deque([vertex.name])
+        while queue:
+            for name in adjacent_vertices(graph, queue.popleft()):
+                if name not in visited:
+                    visited.add(name)
+                    queue.append(name)
+    return components
+
+
+def main(size):
+    seed(0)
+    graph, elapsed = timed(random_graph, size, 5 * size)
+    print(f'{size:,} vertices, {5 * size:,} edges loaded in {elapsed:6.2f} s')
+
+    for num_vertices in (size // 100, size // 10):
+        smaller = random_graph(num_vertices, 5 * num_vertices)
+        _, listed = timed(breadth_first, smaller, Graph.get_adjacent_vertices_by_vertex_name)
+        line = f'BFS over {num_vertices:>9,} vertices: adjacency lists {1e3 * listed:10.1f} ms'
+        if num_vertices <= SCAN_LIMIT:
+            _, scanned = timed(breadth_first, smaller, scan_adjacent_vertices)
+            line += f'  edge-list scan {1e3 * scanned:10.1f} ms'
+        print(line)
+    _, listed = timed(breadth_first, graph, Graph.get_adjacent_vertices_by_vertex_name)
+    print(f'BFS over {size:>9,} vertices: adjacency lists {1e3 * listed:10.1f} ms')
+
+    _, per_edge = footprint(size // 10, size // 2)
+    frozen, elapsed = timed(CSRGraph.from_graph, graph)
+    csr_bytes = frozen.indptr.nbytes + frozen.indices.nbytes + frozen.weights.nbytes
+    print(f'Graph {per_edge:6.1f} bytes/edge, CSRGraph arrays {csr_bytes / (5 * size):6.1f} bytes/edge'
+          f'  (frozen in {1e3 * elapsed:8.1f} ms)')
+    _, hops = timed(frozen.get_hop_counts_from, 0)
+    _, dijkstra = timed(frozen.get_shortest_distances_from, 0)
+    _, stepped = timed(frozen.get_steps_for_shortest_paths_from, 0)
+    print(f'CSRGraph from vertex 0: BFS hop counts {1e3 * hops:10.1f} ms  Dijkstra {1e3 * dijkstra:10.1f} ms'
+          f'  shortest path steps {1e3 * stepped:10.1f} ms')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 5)
@@ -113,7 +113,7 @@ class JKUMap(Graph):
         d, p = self._dijkstra(from_vertex)
         return d
 
-    def helper(self, c: Vertex, visited_list, distances: dict, paths: dict):
+    def helper(self, c: Vertex, visited_list, distances: dict, paths: dict, visited_names=None):
         """
         This method is expected to be called with correctly initialized data structures and recursively calls itself.
 
@@ -121,13 +121,17 @@ class JKUMap(Graph):
         :param visited_list: List which stores already visited vertices.
         :param distances: Dict (nVertices entries) which stores the min. distance to each vertex.
         :param paths: Dict (nVertices entries) which stores the shortest path to each vertex.
+        :param visited_names: Set of the names of the vertices in visited_list, for O(1) membership tests.
         """
+        if visited_names is None:
+            visited_names = {x.name for x in visited_list}
 
         visited_list.append(c)
-        ver = self.get_adjacent_vertices(c)
-        for v in ver:
-            if v not in visited_list:
-                nwe_dist = distances[c.name] + self.find_edge(c, self.find_vertex(v)).weight
+        visited_names.add(c.name)
+        for neighbour, weight in self.get_adjacency_list(c):
+            v = neighbour.name
+            if v not in visited_names:
+                nwe_dist = distances[c.name] + weight
                 if nwe_dist < distances[v]:
                     distances[v] = nwe_dist
                     paths[v] = paths[visited_list[-1].name].copy()
@@ -136,7 +140,7 @@ class JKUMap(Graph):
         min, not_, next = math.inf, [], None
 
         for l in distances:
-            if l not in [x.name for x in visited_list]:
+            if l not in visited_names:
                 not_.append(l)
         try:
             for l in not_:
@@ -144,7 +148,7 @@ class JKUMap(Graph):
                     min = distances[l]
                     next = l
             c = self.find_vertex(next)
-            self.helper(c, visited_list, distances, paths)
+            self.helper(c, visited_list, distances, paths, visited_names)
         except ValueError:
             for l in distances:
                 if distances[l] == math.inf: